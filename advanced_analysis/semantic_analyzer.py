@@ -3,6 +3,22 @@ from typing import List
 
 from models.suspicious_domain import SuspiciousDomain
 
+# Compiled once at import; analyze() runs for every suspicious domain
+_HOMOGLYPH_RE = re.compile(r'[il1]{3,}')
+_BRAND_RE = re.compile(r'^(google|apple|microsoft|amazon|facebook)[-_][a-z0-9]+')
+
+
+def _build_keyword_matcher(keywords: List[str]):
+    """
+    Compile keywords into one zero-width alternation that reports the longest
+    keyword starting at each position, plus a map from that keyword to every
+    keyword that is a prefix of it (e.g. 'payment' -> 'pay', 'payment').
+    """
+    longest_first = sorted(keywords, key=len, reverse=True)
+    pattern = re.compile('(?=(' + '|'.join(re.escape(w) for w in longest_first) + '))')
+    prefixes = {w: tuple(k for k in keywords if w.startswith(k)) for w in keywords}
+    return pattern, prefixes
+
 
 class SemanticAnalyzer:
     """
@@ -14,33 +30,43 @@ class SemanticAnalyzer:
         'login', 'update', 'verify', 'secure', 'bank', 'account', 'reset', 'wallet',
         'support', 'invoice', 'payment', 'auth', 'signin', 'pay', 'gift', 'bonus'
     ]
+    _KEYWORD_RE, _KEYWORD_PREFIXES = _build_keyword_matcher(SUSPICIOUS_KEYWORDS)
+
+    def _keyword_hits(self, text: str) -> set:
+        """All suspicious keywords contained in text, found in a single regex pass"""
+        hits = set()
+        for m in self._KEYWORD_RE.finditer(text):
+            hits.update(self._KEYWORD_PREFIXES[m.group(1)])
+        return hits
 
     def analyze(self, item: SuspiciousDomain) -> SuspiciousDomain:
         domain = item.base_domain.lower()
         labels = [p for p in domain.split('.') if p]
 
-        # Suspicious keywords
+        # Suspicious keywords (none contain '.', so one pass over the domain
+        # finds exactly the keywords present in any label); flagged once each
+        hit_keywords = self._keyword_hits(domain)
         for word in self.SUSPICIOUS_KEYWORDS:
-            for label in labels:
-                if word in label:
-                    item.add_flag('semantic', f'keyword:{word}')
+            if word in hit_keywords:
+                item.add_flag('semantic', f'keyword:{word}')
 
         # Homoglyph-like repeated confusable characters (simplified)
-        if re.search(r'[il1]{3,}', domain):
+        if _HOMOGLYPH_RE.search(domain):
             item.add_flag('semantic', 'homoglyph_like_sequence')
 
         # Brand impersonation heuristic: label with brand + hyphen + extra
-        common_brands = ['google', 'apple', 'microsoft', 'amazon', 'facebook']
+        hit_brands = set()
         for label in labels:
-            for brand in common_brands:
-                if re.match(rf'^{brand}[-_][a-z0-9]+', label):
-                    item.add_flag('semantic', f'brand_impersonation:{brand}')
+            m = _BRAND_RE.match(label)
+            if m and m.group(1) not in hit_brands:
+                hit_brands.add(m.group(1))
+                item.add_flag('semantic', f'brand_impersonation:{m.group(1)}')
 
         # simple score
         score = 0.0
-        if any('keyword:' in f for f in item.semantic_flags):
+        if hit_keywords:
             score -= 5
-        if any('brand_impersonation' in f for f in item.semantic_flags):
+        if hit_brands:
             score -= 15
         item.scores['semantic'] = score
         return item
@@ -1,4 +1,5 @@
-from typing import Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 
 from utils.web_utils import WebAnalyzer
 from models.website_profile import WebsiteProfile
@@ -11,14 +12,24 @@ class StealthCrawler:
     evade bot detection beyond using common headers.
     """
 
-    def __init__(self, timeout: int = 8):
-        self.web = WebAnalyzer(timeout=timeout)
+    def __init__(self, timeout: int = 8, max_workers: int = 8, web: Optional[WebAnalyzer] = None):
+        # Pass a shared WebAnalyzer to reuse its pooled session across crawlers
+        self.web = web or WebAnalyzer(timeout=timeout)
+        self.max_workers = max_workers
 
     def crawl(self, domain: str) -> WebsiteProfile:
         profile = WebsiteProfile(domain=domain)
 
+        # The accessibility, SSL, WHOIS and DNS lookups are independent
+        # network round-trips, so run them concurrently and wait for all.
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            access_future = pool.submit(self.web.check_domain_accessibility, domain)
+            ssl_future = pool.submit(self.web.get_ssl_certificate_info, domain)
+            whois_future = pool.submit(self.web.get_whois_info, domain)
+            dns_future = pool.submit(self.web.get_dns_records, domain)
+
         # Accessibility
-        access = self.web.check_domain_accessibility(domain)
+        access = access_future.result()
         profile.http_accessible = access.get('http_accessible', False)
         profile.https_accessible = access.get('https_accessible', False)
         profile.http_status = access.get('http_status')
@@ -29,7 +40,7 @@ class StealthCrawler:
             profile.errors.append(access['error'])
 
         # SSL
-        ssl_info = self.web.get_ssl_certificate_info(domain)
+        ssl_info = ssl_future.result()
         profile.has_ssl = ssl_info.get('has_ssl', False)
         profile.valid_ssl = ssl_info.get('valid_ssl', False)
         profile.ssl_issuer = ssl_info.get('issuer')
@@ -41,7 +52,7 @@ class StealthCrawler:
             profile.errors.append(ssl_info['error'])
 
         # WHOIS
-        who = self.web.get_whois_info(domain)
+        who = whois_future.result()
         profile.registrar = who.get('registrar')
         profile.creation_date = who.get('creation_date')
         profile.expiration_date = who.get('expiration_date')
@@ -54,7 +65,7 @@ class StealthCrawler:
             profile.errors.append(who['error'])
 
         # DNS records
-        profile.dns_records = self.web.get_dns_records(domain)
+        profile.dns_records = dns_future.result()
 
         # Page meta (only if accessible)
         url = profile.final_url or (f"https://{domain}" if profile.https_accessible else f"http://{domain}")
@@ -77,3 +88,9 @@ class StealthCrawler:
         profile.social_presence = self.web.find_social_media_presence(domain)
 
         return profile
+
+    def crawl_many(self, domains: List[str]) -> Dict[str, WebsiteProfile]:
+        """Crawl several domains concurrently, returning profiles keyed by domain"""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            profiles = pool.map(self.crawl, domains)
+            return dict(zip(domains, profiles))
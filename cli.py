@@ -1,6 +1,8 @@
 import argparse
 import json
 import logging
+import sys
+from enum import Enum
 from utils.config import load_config
 from utils.logging_setup import setup_logging
 from pipeline import run_pcap_pipeline
@@ -28,19 +30,22 @@ def main():
 
     if args.out:
         with open(args.out, 'w', encoding='utf-8') as f:
-            json.dump(_serialize_report(report), f, default=str, indent=2)
+            json.dump(report, f, default=_json_default, indent=2)
         print(f"Report written to {args.out}")
     else:
-        print(json.dumps(_serialize_report(report), default=str, indent=2))
-
-
-def _serialize_report(report):
-    # Convert non-serializable fields, like datetime
-    def convert(obj):
-        if hasattr(obj, 'isoformat'):
-            return obj.isoformat()
-        return obj
-    return json.loads(json.dumps(report, default=convert))
+        json.dump(report, sys.stdout, default=_json_default, indent=2)
+        sys.stdout.write("\n")
+
+
+def _json_default(obj):
+    # Convert non-serializable fields, like datetime, enums and sets
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return str(obj)
 
 
 if __name__ == "__main__":
@@ -3,6 +3,18 @@ from typing import List
 
 from models.suspicious_domain import SuspiciousDomain
 
+# Deletes every non-letter ASCII character in one C-level str.translate call;
+# consonants are then counted as whatever survives deleting the vowels
+_NON_ALPHA_ASCII = str.maketrans('', '', ''.join(chr(i) for i in range(128) if not chr(i).isalpha()))
+_DROP_VOWELS = str.maketrans('', '', 'aeiou')
+
+
+def _letters(text: str) -> str:
+    """Return only the alphabetic characters of text"""
+    if text.isascii():
+        return text.translate(_NON_ALPHA_ASCII)
+    return ''.join(ch for ch in text if ch.isalpha())
+
 
 class SetAnalyzer:
     """
@@ -14,8 +26,8 @@ class SetAnalyzer:
         self.min_unique_threshold = 10
 
     def analyze(self, item: SuspiciousDomain) -> SuspiciousDomain:
-        subdomains: List[str] = list(item.unique_subdomains) or [q.subdomain for q in item.queries if q.subdomain]
-        total = item.total_queries or len(item.queries)
+        subdomains: List[str] = list(item.unique_subdomains) or [s for s in item.query_subdomains if s]
+        total = item.total_queries or len(item.query_timestamps)
         uniq = len(set(subdomains))
 
         # Cardinality ratio
@@ -25,7 +37,7 @@ class SetAnalyzer:
                 item.add_flag('set', f'high_cardinality_ratio:{ratio:.2f}')
 
         # Single-use subdomains proportion
-        counts = Counter([q.subdomain for q in item.queries if q.subdomain])
+        counts = item.subdomain_counts or Counter(s for s in item.query_subdomains if s)
         single_use = sum(1 for c in counts.values() if c == 1)
         if counts:
             single_ratio = single_use / len(counts)
@@ -34,29 +46,30 @@ class SetAnalyzer:
 
         # Simple DGA-ish heuristic: average label length and consonant/vowel ratio
         if subdomains:
-            avg_len = sum(len(s) for s in subdomains) / len(subdomains)
-            if avg_len > 20:
-                item.add_flag('set', f'long_labels_avg:{avg_len:.1f}')
-            vowels = set('aeiou')
+            total_len = 0
             consonant_heavy = 0
             for s in subdomains:
-                letters = [ch for ch in s.lower() if ch.isalpha()]
+                total_len += len(s)
+                letters = _letters(s.lower())
                 if not letters:
                     continue
-                v = sum(1 for ch in letters if ch in vowels)
-                c = sum(1 for ch in letters if ch not in vowels)
+                c = len(letters.translate(_DROP_VOWELS))
+                v = len(letters) - c
                 if c >= 3 * max(v, 1):
                     consonant_heavy += 1
-            if subdomains and consonant_heavy / len(subdomains) > 0.5:
+            avg_len = total_len / len(subdomains)
+            if avg_len > 20:
+                item.add_flag('set', f'long_labels_avg:{avg_len:.1f}')
+            if consonant_heavy / len(subdomains) > 0.5:
                 item.add_flag('set', 'consonant_heavy_labels')
 
         # basic score
         score = 0.0
-        if any('high_cardinality' in f for f in item.set_flags):
+        if 'high_cardinality_ratio' in item.flag_prefixes:
             score -= 10
-        if any('single_use' in f for f in item.set_flags):
+        if 'single_use_subdomains_ratio' in item.flag_prefixes:
             score -= 10
-        if any('long_labels' in f for f in item.set_flags):
+        if 'long_labels_avg' in item.flag_prefixes:
             score -= 5
         item.scores['set'] = score
         return item
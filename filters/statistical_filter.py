@@ -1,16 +1,33 @@
-import sys
-import os
+import csv
+import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Set
-from collections import defaultdict, Counter
-
-# Add parent directory to path for imports
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from typing import Iterable, List, Dict, Set
+from collections import Counter
 
 from models.dns_query import DNSQuery
 from models.suspicious_domain import SuspiciousDomain
 from utils.entropy_calc import calculate_domain_entropy, calculate_subdomain_entropy
 
+logger = logging.getLogger(__name__)
+
+
+class _DomainStats:
+    """Per-base-domain tracking state kept by StatisticalFilter"""
+    __slots__ = ('query_count', 'subdomain_counts', 'max_subdomain_length', 'source_ips',
+                 'query_types', 'first_seen', 'last_seen')
+
+    def __init__(self, first_timestamp: datetime):
+        # Aggregates only; individual DNSQuery objects are not retained
+        self.query_count = 0
+        self.subdomain_counts: Counter = Counter()  # keys double as the unique subdomain set
+        self.max_subdomain_length = 0
+        self.source_ips: Set[str] = set()
+        self.query_types: Counter = Counter()
+        # Seeded from the first query so updates never need a None check
+        self.first_seen = first_timestamp
+        self.last_seen = first_timestamp
+
+
 class StatisticalFilter:
     """
     First stage filter: Statistical analysis to identify potentially suspicious domains
@@ -27,59 +44,59 @@ class StatisticalFilter:
         }
         
         # Internal tracking
-        self.domain_stats = defaultdict(lambda: {
-            'queries': [],
-            'unique_subdomains': set(),
-            'source_ips': set(),
-            'query_types': Counter(),
-            'first_seen': None,
-            'last_seen': None
-        })
+        self.domain_stats: Dict[str, _DomainStats] = {}
         
         self.suspicious_domains = {}
         self.total_queries_processed = 0
         
-    def process_dns_queries(self, queries: List[DNSQuery]) -> List[SuspiciousDomain]:
+    def process_dns_queries(self, queries: Iterable[DNSQuery]) -> List[SuspiciousDomain]:
         """
-        Process a batch of DNS queries and identify suspicious domains
+        Process a batch of DNS queries and identify suspicious domains.
+        Queries are consumed in a single pass, so any iterable (e.g. a
+        generator streaming from a PCAP) works.
         Returns list of domains flagged as suspicious
         """
-        print(f"Processing {len(queries)} DNS queries...")
-        
         # Update domain statistics
+        processed = 0
         for query in queries:
             self._update_domain_stats(query)
-            self.total_queries_processed += 1
+            processed += 1
+        self.total_queries_processed += processed
         
         # Analyze and flag suspicious domains
         newly_suspicious = self._analyze_domains()
         
-        print(f"Identified {len(newly_suspicious)} suspicious domains from {len(queries)} queries")
+        logger.info("Identified %d suspicious domains from %d queries", len(newly_suspicious), processed)
         return newly_suspicious
     
     def _update_domain_stats(self, query: DNSQuery):
         """Update tracking statistics for a domain"""
         base_domain = query.base_domain
-        stats = self.domain_stats[base_domain]
+        stats = self.domain_stats.get(base_domain)
+        if stats is None:
+            stats = self.domain_stats[base_domain] = _DomainStats(query.timestamp)
         
-        # Add query to list
-        stats['queries'].append(query)
+        stats.query_count += 1
         
-        # Track unique subdomains
-        if query.subdomain:
-            stats['unique_subdomains'].add(query.subdomain)
+        # Track per-subdomain counts and the longest subdomain seen
+        subdomain = query.subdomain
+        if subdomain:
+            stats.subdomain_counts[subdomain] += 1
+            if len(subdomain) > stats.max_subdomain_length:
+                stats.max_subdomain_length = len(subdomain)
         
         # Track source IPs
-        stats['source_ips'].add(query.source_ip)
+        stats.source_ips.add(query.source_ip)
         
         # Track query types
-        stats['query_types'][query.query_type] += 1
+        stats.query_types[query.query_type] += 1
         
         # Update time bounds
-        if stats['first_seen'] is None or query.timestamp < stats['first_seen']:
-            stats['first_seen'] = query.timestamp
-        if stats['last_seen'] is None or query.timestamp > stats['last_seen']:
-            stats['last_seen'] = query.timestamp
+        timestamp = query.timestamp
+        if timestamp < stats.first_seen:
+            stats.first_seen = timestamp
+        elif timestamp > stats.last_seen:
+            stats.last_seen = timestamp
     
     def _analyze_domains(self) -> List[SuspiciousDomain]:
         """Analyze collected domain statistics and flag suspicious ones"""
@@ -91,24 +108,24 @@ class StatisticalFilter:
                 continue
             
             # Skip if insufficient data
-            if len(stats['queries']) < 2:
+            if stats.query_count < 2:
                 continue
             
             # Perform statistical analysis
             flags = self._check_statistical_indicators(base_domain, stats)
             
             if flags:
-                # Create SuspiciousDomain object
+                # Create SuspiciousDomain object from the tracked aggregates
                 suspicious_domain = SuspiciousDomain(
                     base_domain=base_domain,
-                    first_seen=stats['first_seen'],
-                    last_seen=stats['last_seen']
+                    first_seen=stats.first_seen,
+                    last_seen=stats.last_seen,
+                    total_queries=stats.query_count,
+                    unique_subdomains=set(stats.subdomain_counts),
+                    subdomain_counts=Counter(stats.subdomain_counts),
+                    source_ips=set(stats.source_ips)
                 )
                 
-                # Add all queries to the suspicious domain
-                for query in stats['queries']:
-                    suspicious_domain.add_query(query)
-                
                 # Add flags
                 for flag in flags:
                     suspicious_domain.add_flag("statistical", flag)
@@ -117,76 +134,69 @@ class StatisticalFilter:
                 self.suspicious_domains[base_domain] = suspicious_domain
                 newly_suspicious.append(suspicious_domain)
                 
-                print(f"Flagged {base_domain}: {', '.join(flags)}")
+                logger.debug("Flagged %s: %s", base_domain, ', '.join(flags))
         
         return newly_suspicious
     
-    def _check_statistical_indicators(self, base_domain: str, stats: Dict) -> List[str]:
+    def _check_statistical_indicators(self, base_domain: str, stats: _DomainStats) -> List[str]:
         """Check for statistical indicators of suspicious behavior"""
         flags = []
+        subdomain_counts = stats.subdomain_counts
+        unique_count = len(subdomain_counts)
         
         # 1. High frequency check
-        time_window = (stats['last_seen'] - stats['first_seen']).total_seconds() / 60
+        time_window = (stats.last_seen - stats.first_seen).total_seconds() / 60
         if time_window > 0:
-            frequency = len(stats['queries']) / time_window
+            frequency = stats.query_count / time_window
             if frequency > self.thresholds['frequency_per_minute']:
                 flags.append(f"high_frequency_{frequency:.1f}_per_min")
         
-        # 2. Long subdomain check
-        for subdomain in stats['unique_subdomains']:
-            if len(subdomain) > self.thresholds['max_subdomain_length']:
-                flags.append(f"long_subdomain_{len(subdomain)}_chars")
-                break
+        # 2. Long subdomain check (longest label, independent of set order)
+        longest_subdomain = stats.max_subdomain_length
+        if longest_subdomain > self.thresholds['max_subdomain_length']:
+            flags.append(f"long_subdomain_{longest_subdomain}_chars")
         
         # 3. High entropy check
-        high_entropy_count = 0
-        for subdomain in stats['unique_subdomains']:
-            entropy = calculate_subdomain_entropy(subdomain)
-            if entropy > self.thresholds['high_entropy_threshold']:
-                high_entropy_count += 1
+        entropy_threshold = self.thresholds['high_entropy_threshold']
+        high_entropy_count = sum(
+            1 for entropy in map(calculate_subdomain_entropy, subdomain_counts)
+            if entropy > entropy_threshold
+        )
         
         if high_entropy_count > 0:
-            ratio = high_entropy_count / len(stats['unique_subdomains'])
+            ratio = high_entropy_count / unique_count
             flags.append(f"high_entropy_{high_entropy_count}_subdomains_{ratio:.2f}_ratio")
         
         # 4. Single-use domain pattern
-        single_use_count = 0
-        subdomain_counts = Counter()
-        for query in stats['queries']:
-            if query.subdomain:
-                subdomain_counts[query.subdomain] += 1
-        
-        for count in subdomain_counts.values():
-            if count == 1:
-                single_use_count += 1
+        single_use_count = sum(1 for count in subdomain_counts.values() if count == 1)
         
         if single_use_count > 5:  # More than 5 single-use subdomains
-            single_use_ratio = single_use_count / len(subdomain_counts)
+            single_use_ratio = single_use_count / unique_count
             flags.append(f"single_use_pattern_{single_use_count}_domains_{single_use_ratio:.2f}_ratio")
         
         # 5. Unusual query type patterns
-        total_queries = sum(stats['query_types'].values())
+        total_queries = sum(stats.query_types.values())
         if total_queries > 10:
             # Check for predominantly TXT queries (often used in DNS tunneling)
-            txt_ratio = stats['query_types'].get('TXT', 0) / total_queries
+            txt_ratio = stats.query_types.get('TXT', 0) / total_queries
             if txt_ratio > 0.8:
                 flags.append(f"txt_heavy_{txt_ratio:.2f}_ratio")
             
             # Check for mixed query types (unusual for normal browsing)
-            unique_types = len(stats['query_types'])
+            unique_types = len(stats.query_types)
             if unique_types > 3:
                 flags.append(f"mixed_query_types_{unique_types}_types")
         
         # 6. Rapid subdomain generation
-        if len(stats['unique_subdomains']) > 20:
+        if unique_count > 20:
             if time_window > 0:
-                subdomain_rate = len(stats['unique_subdomains']) / time_window
+                subdomain_rate = unique_count / time_window
                 if subdomain_rate > 2:  # More than 2 unique subdomains per minute
                     flags.append(f"rapid_subdomain_generation_{subdomain_rate:.1f}_per_min")
         
         # 7. High cardinality ratio
         if total_queries > 10:
-            cardinality_ratio = len(stats['unique_subdomains']) / total_queries
+            cardinality_ratio = unique_count / total_queries
             if cardinality_ratio > 0.8:
                 flags.append(f"high_cardinality_{cardinality_ratio:.2f}_ratio")
         
@@ -210,7 +220,7 @@ class StatisticalFilter:
     def update_thresholds(self, new_thresholds: Dict):
         """Update detection thresholds"""
         self.thresholds.update(new_thresholds)
-        print(f"Updated thresholds: {self.thresholds}")
+        logger.info("Updated thresholds: %s", self.thresholds)
     
     def clear_old_data(self, hours: int = 24):
         """Clear domain statistics older than specified hours"""
@@ -218,7 +228,7 @@ class StatisticalFilter:
         
         domains_to_remove = []
         for domain, stats in self.domain_stats.items():
-            if stats['last_seen'] < cutoff_time:
+            if stats.last_seen < cutoff_time:
                 domains_to_remove.append(domain)
         
         for domain in domains_to_remove:
@@ -226,21 +236,28 @@ class StatisticalFilter:
             if domain in self.suspicious_domains:
                 del self.suspicious_domains[domain]
         
-        print(f"Cleared {len(domains_to_remove)} old domain entries")
+        logger.info("Cleared %d old domain entries", len(domains_to_remove))
     
     def export_suspicious_domains(self, filename: str):
         """Export suspicious domains to file"""
-        with open(filename, 'w') as f:
-            f.write("Domain,First_Seen,Last_Seen,Query_Count,Unique_Subdomains,Flags\n")
-            
-            for domain in self.suspicious_domains.values():
-                flags_str = ';'.join(domain.statistical_flags)
-                f.write(f"{domain.base_domain},{domain.first_seen},{domain.last_seen},"
-                       f"{domain.total_queries},{len(domain.unique_subdomains)},{flags_str}\n")
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Domain', 'First_Seen', 'Last_Seen', 'Query_Count', 'Unique_Subdomains', 'Flags'])
+            writer.writerows(
+                (
+                    domain.base_domain,
+                    domain.first_seen.isoformat() if domain.first_seen else '',
+                    domain.last_seen.isoformat() if domain.last_seen else '',
+                    domain.total_queries,
+                    len(domain.unique_subdomains),
+                    ';'.join(domain.statistical_flags)
+                )
+                for domain in self.suspicious_domains.values()
+            )
         
-        print(f"Exported {len(self.suspicious_domains)} suspicious domains to {filename}")
+        logger.info("Exported %d suspicious domains to %s", len(self.suspicious_domains), filename)
 
-# Example usage and testing
+# Example usage and testing (from the repository root: python -m filters.statistical_filter)
 if __name__ == "__main__":
     # Test the statistical filter
     filter_engine = StatisticalFilter()
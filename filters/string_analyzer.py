@@ -1,10 +1,11 @@
-from typing import List
+from itertools import islice
+from typing import List, Optional
 
 from models.suspicious_domain import SuspiciousDomain
 from utils.string_operations import (
     extract_patterns,
     detect_sequential_patterns,
-    detect_encoding_patterns,
+    count_encoding_patterns,
 )
 
 
@@ -14,11 +15,15 @@ class StringAnalyzer:
     to uncover encoding patterns, templates, and sequential generation behavior.
     """
 
-    def __init__(self, max_edit_distance: int = 2):
+    def __init__(self, max_edit_distance: int = 2, max_subdomains: Optional[int] = 10_000):
         self.max_edit_distance = max_edit_distance
+        # Cap on subdomains examined per domain; the sequential-pattern pass is
+        # quadratic, so huge tunneling domains are analyzed on a first-seen sample
+        self.max_subdomains = max_subdomains
 
     def analyze(self, item: SuspiciousDomain) -> SuspiciousDomain:
-        domains: List[str] = [q.subdomain for q in item.queries if q.subdomain] or list(item.unique_subdomains)
+        domains: List[str] = (list(islice((s for s in item.query_subdomains if s), self.max_subdomains))
+                              or item.subdomain_sample(self.max_subdomains))
         # Include base domain for encoding pattern check
         candidate_strings = domains + [item.base_domain]
 
@@ -30,25 +35,20 @@ class StringAnalyzer:
             item.add_flag('string', 'long_label_distribution')
 
         # Sequential generation pairs
-        seq_pairs = detect_sequential_patterns(domains, max_edit_distance=self.max_edit_distance)
+        # Repeated subdomains would only pair with themselves at distance 0
+        seq_pairs = detect_sequential_patterns(list(dict.fromkeys(domains)), max_edit_distance=self.max_edit_distance)
         if len(seq_pairs) >= 3:
             item.add_flag('string', f'sequential_generation_pairs:{len(seq_pairs)}')
 
         # Encoding-like patterns on base domain and subdomains
-        enc_flags_count = 0
-        for s in candidate_strings:
-            enc = detect_encoding_patterns(s)
-            for k, v in enc.items():
-                if v:
-                    enc_flags_count += 1
-        if enc_flags_count >= 3:
+        if count_encoding_patterns(candidate_strings) >= 3:
             item.add_flag('string', 'encoding_like_patterns')
 
         # Optional simple score
         score = 0.0
-        if any('encoding_like' in f or 'base64' in f for f in item.string_flags):
+        if 'encoding_like_patterns' in item.flag_prefixes:
             score -= 10
-        if any('sequential_generation' in f for f in item.string_flags):
+        if 'sequential_generation_pairs' in item.flag_prefixes:
             score -= 5
         item.scores['string'] = score
         return item
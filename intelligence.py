@@ -121,15 +121,16 @@ FUTURE ENHANCEMENTS:
 
 """
 
-import sys
 import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain, repeat
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 from enum import Enum
 
-# Add modules to path
-sys.path.append(os.path.dirname(__file__))
-
 class LegitimacyLevel(Enum):
     LEGITIMATE = "legitimate"
     SUSPICIOUS = "suspicious" 
@@ -137,6 +138,245 @@ class LegitimacyLevel(Enum):
     CONFIRMED_FAKE = "confirmed_fake"
     UNKNOWN = "unknown"
 
+
+_HIGH_RISK_LEVELS = (LegitimacyLevel.LIKELY_FAKE, LegitimacyLevel.CONFIRMED_FAKE)
+
+# bulk_analyze only pays the process start-up and pickling cost on large
+# batches and when there is more than one CPU to spread them over
+_PARALLEL_MIN_DOMAINS = 512
+_PARALLEL_CHUNKSIZE = 256
+
+
+# WebsiteProfile fields the scoring rules read
+_WEB_FIELDS = ('age_days', 'valid_ssl', 'content_length', 'social_presence', 'name_servers',
+               'http_accessible', 'https_accessible', 'privacy_protected', 'blacklist')
+
+
+def _web_signature(web_profile) -> Optional[Tuple]:
+    """
+    Reduce a web profile (a dict or a WebsiteProfile) to the facts the scoring
+    rules branch on. Numeric fields are bucketed at the rule thresholds, so
+    profiles that score the same share a signature.
+    """
+    if not web_profile:
+        return None
+    # Normalise to a dict once instead of dispatching on the type per field
+    if isinstance(web_profile, dict):
+        wp = web_profile
+    else:
+        wp = {key: getattr(web_profile, key, None) for key in _WEB_FIELDS}
+
+    age_days = wp.get('age_days')
+    if not isinstance(age_days, int):
+        age_bucket = None
+    elif age_days > 365:
+        age_bucket = 'over_1y'
+    elif age_days < 90:
+        age_bucket = 'under_90d'
+    else:
+        age_bucket = 'between'
+
+    content_length = wp.get('content_length')
+    if not isinstance(content_length, int):
+        content_bucket = None
+    else:
+        content_bucket = 2 if content_length > 1000 else (1 if content_length > 500 else 0)
+
+    social_presence = wp.get('social_presence')
+    ns = wp.get('name_servers')
+    blacklist = wp.get('blacklist')
+    return (
+        age_bucket,
+        bool(wp.get('valid_ssl')),
+        content_bucket,
+        isinstance(social_presence, dict) and any(social_presence.values()),
+        bool(ns) and len(ns) >= 2,
+        bool(wp.get('http_accessible') or wp.get('https_accessible')),
+        bool(wp.get('privacy_protected')),
+        isinstance(blacklist, dict) and any(blacklist.values()),
+    )
+
+
+# Flag name prefixes that the scoring rules react to (analyzers emit flags as
+# '<name>_<detail>' or '<name>:<detail>')
+_FLAG_INDICATORS = ('high_frequency', 'high_entropy', 'single_use', 'txt_heavy', 'rapid_subdomain',
+                    'high_cardinality', 'single_use_pattern', 'single_use_subdomains')
+_MAJOR_STAT_INDICATORS = frozenset(('high_frequency', 'high_entropy', 'single_use', 'txt_heavy',
+                                     'rapid_subdomain', 'high_cardinality'))
+_SINGLE_USE_INDICATORS = frozenset(('single_use_pattern', 'single_use_subdomains'))
+
+
+# One anchored alternation, longest names first, finds the longest indicator a
+# flag starts with; _INDICATOR_PREFIXES expands it to every indicator that
+# is a prefix of it (e.g. single_use_pattern also counts as single_use)
+_INDICATOR_RE = re.compile('|'.join(map(re.escape, sorted(_FLAG_INDICATORS, key=len, reverse=True))))
+_INDICATOR_PREFIXES = {
+    name: frozenset(other for other in _FLAG_INDICATORS if name.startswith(other))
+    for name in _FLAG_INDICATORS
+}
+
+
+def _flag_indicators(flags) -> frozenset:
+    """Scan a flag list once and return the scoring indicators its flags start with"""
+    found = set()
+    match = _INDICATOR_RE.match
+    for f in flags:
+        m = match(f)
+        if m:
+            found |= _INDICATOR_PREFIXES[m.group()]
+    return frozenset(found)
+
+
+# Scoring rules as (label, points, condition). Conditions are expressions over
+# the arguments of _apply_rules and are compiled into it once at import.
+_POSITIVE_RULES = (
+    ('domain_age>1y', 15, "age_bucket == 'over_1y'"),
+    ('valid_ssl', 10, 'valid_ssl'),
+    ('active_site_content', 15, 'content_bucket'),               # content_length > 500
+    ('social_presence', 10, 'social_presence'),                  # placeholder heuristic: any True
+    ('normal_dns_patterns', 10, 'not stat_indicators & _MAJOR_STAT_INDICATORS'),
+    ('established_ns', 5, 'established_ns'),
+    ('contact_info_signals', 5, 'content_bucket == 2'),          # content_length > 1000
+)
+_NEGATIVE_RULES = (
+    ('high_entropy_subdomains', 20, "'high_entropy' in stat_indicators"),
+    ('excessive_query_frequency', 15, "'high_frequency' in stat_indicators"),
+    ('single_use_pattern', 15, '(stat_indicators | set_indicators) & _SINGLE_USE_INDICATORS'),
+    ('no_web_presence', 10, 'not reachable'),
+    ('recent_registration', 10, "age_bucket == 'under_90d'"),
+    ('privacy_protected', 5, 'privacy'),
+    ('suspicious_query_types', 10, "'txt_heavy' in stat_indicators"),
+    ('blacklisted', 30, 'blacklisted'),
+)
+_RULE_ARGS = ('stat_indicators', 'set_indicators', 'age_bucket', 'valid_ssl', 'content_bucket',
+              'social_presence', 'established_ns', 'reachable', 'privacy', 'blacklisted')
+
+
+def _compile_rules():
+    """Generate a straight-line function applying every scoring rule in order"""
+    lines = [f"def _apply_rules({', '.join(_RULE_ARGS)}):",
+             '    score = 50',
+             '    positives = []',
+             '    negatives = []']
+    for rules, sign, target in ((_POSITIVE_RULES, '+', 'positives'), (_NEGATIVE_RULES, '-', 'negatives')):
+        for label, points, condition in rules:
+            lines.append(f'    if {condition}:')
+            lines.append(f'        score {sign}= {points}')
+            lines.append(f'        {target}.append({label!r})')
+    lines.append('    return score, positives, negatives')
+    namespace = {
+        '_MAJOR_STAT_INDICATORS': _MAJOR_STAT_INDICATORS,
+        '_SINGLE_USE_INDICATORS': _SINGLE_USE_INDICATORS,
+    }
+    exec(compile('\n'.join(lines), '<intelligence rules>', 'exec'), namespace)
+    return namespace['_apply_rules']
+
+
+_apply_rules = _compile_rules()
+
+
+@lru_cache(maxsize=16384)
+def _score(stat_indicators: frozenset, set_indicators: frozenset, has_statistical_flags: bool,
+           has_string_flags: bool, has_set_flags: bool, has_semantic_flags: bool,
+           web: Optional[Tuple], has_history: bool) -> Tuple:
+    """
+    Pure scoring step of Intelligence.analyze_domain, memoized on its inputs.
+    Returns (score, positives, negatives, confidence, level, recommendation).
+    """
+    age_bucket, valid_ssl, content_bucket, social_presence, established_ns, reachable, privacy, blacklisted = (
+        web or (None, False, None, False, False, True, False, False)
+    )
+    score, positives, negatives = _apply_rules(
+        stat_indicators, set_indicators, age_bucket, valid_ssl, content_bucket,
+        social_presence, established_ns, reachable, privacy, blacklisted,
+    )
+
+    # Confidence scoring based on number of sources available
+    sources = sum((has_statistical_flags, has_string_flags, has_set_flags, has_semantic_flags,
+                   web is not None, has_history))
+    confidence = min(1.0, 0.2 + 0.15 * sources)  # 0.2 base + 0.15 per source up to 1.0
+
+    # Determine legitimacy level
+    level = LegitimacyLevel.UNKNOWN
+    recommendation = 'INVESTIGATE'
+
+    # Hard override for confirmed fake
+    if blacklisted or ('txt_heavy' in stat_indicators and 'high_entropy' in stat_indicators):
+        level = LegitimacyLevel.CONFIRMED_FAKE
+        recommendation = 'BLOCK'
+    else:
+        if score >= 75:
+            level = LegitimacyLevel.LEGITIMATE
+            recommendation = 'ALLOW'
+        elif score >= 60:
+            level = LegitimacyLevel.SUSPICIOUS
+            recommendation = 'MONITOR'
+        elif score >= 40:
+            level = LegitimacyLevel.LIKELY_FAKE
+            recommendation = 'INVESTIGATE'
+        else:
+            level = LegitimacyLevel.CONFIRMED_FAKE
+            recommendation = 'BLOCK'
+
+    return score, tuple(positives), tuple(negatives), confidence, level, recommendation
+
+
+def _score_domain(domain: str, analysis_data: Dict, timestamp: Optional[datetime] = None) -> Dict:
+    """
+    Build the assessment for one domain. Pure, so bulk_analyze can run it
+    in worker processes. Without a timestamp the current time is used.
+    """
+    # Extract commonly expected inputs (all optional, robust to missing)
+    statistical_flags = (analysis_data.get('statistical_flags') or [])
+    string_flags = (analysis_data.get('string_patterns') or [])
+    set_flags = (analysis_data.get('set_analysis') or [])
+    semantic_flags = (analysis_data.get('semantic_analysis') or [])
+    web_profile = analysis_data.get('web_crawl_results')  # expected shape similar to WebsiteProfile dict
+    website_history = analysis_data.get('website_history') or {}
+
+    # Domains with the same indicators and web profile shape score identically,
+    # so the rules run once per distinct signature
+    score, positives, negatives, confidence, level, recommendation = _score(
+        _flag_indicators(statistical_flags),
+        _flag_indicators(set_flags),
+        bool(statistical_flags),
+        bool(string_flags),
+        bool(set_flags),
+        bool(semantic_flags),
+        _web_signature(web_profile),
+        bool(website_history),
+    )
+
+    # Additional risk factors from other analyzers
+    risk_factors = [fl for fl in chain(string_flags, set_flags, semantic_flags) if isinstance(fl, str)]
+
+    assessment = {
+        'domain': domain,
+        'timestamp': timestamp or datetime.now(),
+        'legitimacy_level': level,
+        'legitimacy_score': max(0, min(100, int(score))),  # clamp to 0-100
+        'confidence': round(confidence, 2),  # 0-1 scale
+        'evidence': {
+            'positive_indicators': list(positives),
+            'negative_indicators': list(negatives),
+            'risk_factors': risk_factors
+        },
+        'recommendation': recommendation,
+        'detailed_analysis': analysis_data
+    }
+    return assessment
+
+
+def _score_domain_remote(domain: str, analysis_data: Dict, timestamp: datetime) -> Dict:
+    """
+    _score_domain for worker processes. The parent re-attaches its own
+    analysis_data instead of having a copy pickled back.
+    """
+    assessment = _score_domain(domain, analysis_data, timestamp)
+    del assessment['detailed_analysis']
+    return assessment
+
+
 class Intelligence:
     """
     The central brain that processes all analysis results and makes final determinations
@@ -145,6 +385,12 @@ class Intelligence:
     def __init__(self):
         self.analysis_results = {}
         self.final_assessments = {}
+        # Report tallies, kept in step with final_assessments by _record
+        self._level_counts: Counter = Counter()
+        self._negative_counts: Counter = Counter()
+        self._high_risk: Dict[str, None] = {}  # insertion-ordered set
+        # Shared wall-clock time for every assessment of a bulk_analyze batch
+        self._batch_ts: Optional[datetime] = None
 
     def analyze_domain(self, domain: str, analysis_data: Dict) -> Dict:
         """
@@ -158,197 +404,63 @@ class Intelligence:
         - web_crawl_results: from stealth crawler
         - website_history: from website history analyzer
         """
-        # Calculate weighted legitimacy score based on provided analysis_data
-        score = 50  # base
-        positives = []
-        negatives = []
-        risk_factors = []
-
-        # Extract commonly expected inputs (all optional, robust to missing)
-        statistical_flags = (analysis_data.get('statistical_flags') or [])
-        string_flags = (analysis_data.get('string_patterns') or [])
-        set_flags = (analysis_data.get('set_analysis') or [])
-        semantic_flags = (analysis_data.get('semantic_analysis') or [])
-        web_profile = analysis_data.get('web_crawl_results')  # expected shape similar to WebsiteProfile dict
-        website_history = analysis_data.get('website_history') or {}
-        blacklist = None
-
-        # POSITIVE INDICATORS
-        # Domain age > 1 year (+15)
-        age_days = None
-        if web_profile and isinstance(web_profile, dict):
-            age_days = web_profile.get('age_days')
-            blacklist = web_profile.get('blacklist')
-        elif hasattr(web_profile, 'age_days'):
-            age_days = getattr(web_profile, 'age_days')
-            blacklist = getattr(web_profile, 'blacklist', None)
-
-        if isinstance(age_days, int) and age_days > 365:
-            score += 15
-            positives.append('domain_age>1y')
-
-        # Valid SSL (+10)
-        valid_ssl = None
-        if web_profile:
-            valid_ssl = web_profile.get('valid_ssl') if isinstance(web_profile, dict) else getattr(web_profile, 'valid_ssl', None)
-        if valid_ssl:
-            score += 10
-            positives.append('valid_ssl')
-
-        # Active website with content (+15)
-        content_length = None
-        if web_profile:
-            content_length = web_profile.get('content_length') if isinstance(web_profile, dict) else getattr(web_profile, 'content_length', None)
-        if isinstance(content_length, int) and content_length > 500:
-            score += 15
-            positives.append('active_site_content')
-
-        # Social media presence (+10) — placeholder heuristic: any True
-        if web_profile:
-            social_presence = web_profile.get('social_presence') if isinstance(web_profile, dict) else getattr(web_profile, 'social_presence', {})
-            if isinstance(social_presence, dict) and any(social_presence.values()):
-                score += 10
-                positives.append('social_presence')
-
-        # Normal DNS query patterns (+10) — if no major statistical flags
-        major_stat_flags = [f for f in statistical_flags if any(k in f for k in ['high_frequency', 'high_entropy', 'single_use', 'txt_heavy', 'rapid_subdomain', 'high_cardinality'])]
-        if not major_stat_flags:
-            score += 10
-            positives.append('normal_dns_patterns')
-
-        # Established nameservers (+5)
-        if web_profile:
-            ns = web_profile.get('name_servers') if isinstance(web_profile, dict) else getattr(web_profile, 'name_servers', [])
-            if ns and len(ns) >= 2:
-                score += 5
-                positives.append('established_ns')
-
-        # Contact information present (+5) — heuristic via page content length and links
-        if isinstance(content_length, int) and content_length > 1000:
-            score += 5
-            positives.append('contact_info_signals')
-
-        # NEGATIVE INDICATORS
-        # High entropy in subdomains (-20)
-        if any('high_entropy' in f for f in statistical_flags):
-            score -= 20
-            negatives.append('high_entropy_subdomains')
-
-        # Excessive query frequency (-15)
-        if any('high_frequency' in f for f in statistical_flags):
-            score -= 15
-            negatives.append('excessive_query_frequency')
-
-        # Single-use domain pattern (-15)
-        if any('single_use_pattern' in f or 'single_use_subdomains' in f for f in (statistical_flags + list(set_flags))):
-            score -= 15
-            negatives.append('single_use_pattern')
-
-        # No web presence (-10)
-        if web_profile:
-            http_ok = web_profile.get('http_accessible') if isinstance(web_profile, dict) else getattr(web_profile, 'http_accessible', False)
-            https_ok = web_profile.get('https_accessible') if isinstance(web_profile, dict) else getattr(web_profile, 'https_accessible', False)
-            if not http_ok and not https_ok:
-                score -= 10
-                negatives.append('no_web_presence')
-
-        # Recent registration (-10)
-        if isinstance(age_days, int) and age_days < 90:
-            score -= 10
-            negatives.append('recent_registration')
-
-        # Privacy-protected WHOIS (-5)
-        if web_profile:
-            privacy = web_profile.get('privacy_protected') if isinstance(web_profile, dict) else getattr(web_profile, 'privacy_protected', False)
-            if privacy:
-                score -= 5
-                negatives.append('privacy_protected')
-
-        # Suspicious query types (-10)
-        if any('txt_heavy' in f for f in statistical_flags):
-            score -= 10
-            negatives.append('suspicious_query_types')
-
-        # Blacklist presence (-30)
-        blacklisted = False
-        if isinstance(blacklist, dict) and any(blacklist.values()):
-            blacklisted = True
-            score -= 30
-            negatives.append('blacklisted')
-
-        # Additional risk factors from other analyzers
-        for fl in list(string_flags) + list(set_flags) + list(semantic_flags):
-            if isinstance(fl, str):
-                risk_factors.append(fl)
-
-        # Confidence scoring based on number of sources available
-        sources = 0
-        if statistical_flags: sources += 1
-        if string_flags: sources += 1
-        if set_flags: sources += 1
-        if semantic_flags: sources += 1
-        if web_profile: sources += 1
-        if website_history: sources += 1
-        confidence = min(1.0, 0.2 + 0.15 * sources)  # 0.2 base + 0.15 per source up to 1.0
-
-        # Determine legitimacy level
-        level = LegitimacyLevel.UNKNOWN
-        recommendation = 'INVESTIGATE'
-
-        # Hard override for confirmed fake
-        if blacklisted or (any('txt_heavy' in f for f in statistical_flags) and any('high_entropy' in f for f in statistical_flags)):
-            level = LegitimacyLevel.CONFIRMED_FAKE
-            recommendation = 'BLOCK'
-        else:
-            if score >= 75:
-                level = LegitimacyLevel.LEGITIMATE
-                recommendation = 'ALLOW'
-            elif score >= 60:
-                level = LegitimacyLevel.SUSPICIOUS
-                recommendation = 'MONITOR'
-            elif score >= 40:
-                level = LegitimacyLevel.LIKELY_FAKE
-                recommendation = 'INVESTIGATE'
-            else:
-                level = LegitimacyLevel.CONFIRMED_FAKE
-                recommendation = 'BLOCK'
-
-        assessment = {
-            'domain': domain,
-            'timestamp': datetime.now(),
-            'legitimacy_level': level,
-            'legitimacy_score': max(0, min(100, int(score))),  # clamp to 0-100
-            'confidence': round(confidence, 2),  # 0-1 scale
-            'evidence': {
-                'positive_indicators': positives,
-                'negative_indicators': negatives,
-                'risk_factors': risk_factors
-            },
-            'recommendation': recommendation,
-            'detailed_analysis': analysis_data
-        }
+        assessment = _score_domain(domain, analysis_data, self._batch_ts)
         # Save to final assessments
-        self.final_assessments[domain] = assessment
+        self._record(domain, assessment)
         return assessment
 
+    def _record(self, domain: str, assessment: Dict) -> None:
+        """Store an assessment and update the report tallies incrementally"""
+        previous = self.final_assessments.get(domain)
+        if previous is not None:
+            self._level_counts[previous['legitimacy_level']] -= 1
+            self._negative_counts.subtract(previous['evidence']['negative_indicators'])
+        self.final_assessments[domain] = assessment
+
+        level = assessment['legitimacy_level']
+        self._level_counts[level] += 1
+        self._negative_counts.update(assessment['evidence']['negative_indicators'])
+        if level in _HIGH_RISK_LEVELS:
+            if domain not in self._high_risk:
+                if previous is None:
+                    self._high_risk[domain] = None
+                else:
+                    # A re-analyzed domain keeps its original position in
+                    # final_assessments, so rebuild to preserve report order
+                    self._high_risk = {d: None for d, a in self.final_assessments.items()
+                                       if a['legitimacy_level'] in _HIGH_RISK_LEVELS}
+        else:
+            self._high_risk.pop(domain, None)
+
     def bulk_analyze(self, domains_data: Dict[str, Dict]) -> Dict[str, Dict]:
         """
         Analyze multiple domains in batch
         """
+        self._batch_ts = datetime.now()
+        try:
+            if len(domains_data) >= _PARALLEL_MIN_DOMAINS and (os.cpu_count() or 1) > 1:
+                return self._bulk_analyze_parallel(domains_data)
+            return {domain: self.analyze_domain(domain, data) for domain, data in domains_data.items()}
+        finally:
+            self._batch_ts = None
+
+    def _bulk_analyze_parallel(self, domains_data: Dict[str, Dict]) -> Dict[str, Dict]:
+        """Score domains in worker processes and record them in input order"""
         results = {}
-        for domain, data in domains_data.items():
-            results[domain] = self.analyze_domain(domain, data)
+        with ProcessPoolExecutor() as executor:
+            assessments = executor.map(_score_domain_remote, domains_data.keys(), domains_data.values(),
+                                       repeat(self._batch_ts), chunksize=_PARALLEL_CHUNKSIZE)
+            for (domain, data), assessment in zip(domains_data.items(), assessments):
+                assessment['detailed_analysis'] = data
+                self._record(domain, assessment)
+                results[domain] = assessment
         return results
 
     def get_high_risk_domains(self) -> List[str]:
         """
         Return domains classified as high risk
         """
-        high_risk = []
-        for domain, assessment in self.final_assessments.items():
-            if assessment['legitimacy_level'] in [LegitimacyLevel.LIKELY_FAKE, LegitimacyLevel.CONFIRMED_FAKE]:
-                high_risk.append(domain)
-        return high_risk
+        return list(self._high_risk)
 
     def generate_report(self) -> Dict:
         """
@@ -363,37 +475,28 @@ class Intelligence:
 
     def _get_legitimacy_breakdown(self) -> Dict[str, int]:
         """Get count breakdown by legitimacy level"""
-        breakdown = {level.value: 0 for level in LegitimacyLevel}
-        for assessment in self.final_assessments.values():
-            level = assessment['legitimacy_level'].value
-            breakdown[level] += 1
-        return breakdown
+        return {level.value: self._level_counts[level] for level in LegitimacyLevel}
 
     def _generate_recommendations(self) -> List[str]:
         """Generate actionable recommendations based on analysis"""
         recommendations: List[str] = []
 
-        breakdown = self._get_legitimacy_breakdown()
-        high_risk = self.get_high_risk_domains()
-
-        if high_risk:
-            recommendations.append(f"Block or sinkhole {len(high_risk)} high-risk domains")
+        # Read the incremental tallies directly; no pass over final_assessments
+        if self._high_risk:
+            recommendations.append(f"Block or sinkhole {len(self._high_risk)} high-risk domains")
 
         # Identify common negative indicators to suggest threshold tuning
-        flag_counter: Dict[str, int] = {}
-        for ass in self.final_assessments.values():
-            for neg in ass['evidence'].get('negative_indicators', []):
-                flag_counter[neg] = flag_counter.get(neg, 0) + 1
+        flag_counter = self._negative_counts
 
-        if flag_counter.get('high_entropy_subdomains', 0) >= 3:
+        if flag_counter['high_entropy_subdomains'] >= 3:
             recommendations.append('Tighten high-entropy thresholds or enable deeper inspection')
-        if flag_counter.get('excessive_query_frequency', 0) >= 3:
+        if flag_counter['excessive_query_frequency'] >= 3:
             recommendations.append('Rate-limit or investigate sources with high DNS query rates')
-        if flag_counter.get('single_use_pattern', 0) >= 3:
+        if flag_counter['single_use_pattern'] >= 3:
             recommendations.append('Inspect potential DNS tunneling with many single-use subdomains')
 
         # General monitoring advice
-        if breakdown.get(LegitimacyLevel.SUSPICIOUS.value, 0) > 0:
+        if self._level_counts[LegitimacyLevel.SUSPICIOUS] > 0:
             recommendations.append('Enable monitoring for suspicious domains and collect more telemetry')
 
         return recommendations
\ No newline at end of file
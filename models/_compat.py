@@ -0,0 +1,4 @@
+import sys
+
+# dataclass(slots=True) needs Python 3.10; older interpreters keep __dict__
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
@@ -1,8 +1,11 @@
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
 
-@dataclass
+from ._compat import DATACLASS_SLOTS
+
+@dataclass(**DATACLASS_SLOTS)
 class DNSQuery:
     """Core DNS query data structure"""
     domain: str
@@ -11,17 +14,28 @@ class DNSQuery:
     query_type: str
     destination_ip: Optional[str] = None
     response_code: Optional[int] = None
+    _parts: Tuple[str, ...] = field(init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """Clean and validate data after initialization"""
         self.domain = self.domain.lower().strip()
         if not self.domain.endswith('.'):
             self.domain += '.'
+        # Low-cardinality fields repeat across millions of queries, so share
+        # one string object per distinct value
+        self.query_type = sys.intern(self.query_type)
+        self.source_ip = sys.intern(self.source_ip)
+        if self.destination_ip:
+            self.destination_ip = sys.intern(self.destination_ip)
+        # Labels are split once here; the properties below only slice them
+        parts = self.domain.rstrip('.').split('.')
+        parts[-1] = sys.intern(parts[-1])
+        self._parts = tuple(parts)
     
     @property
     def subdomain(self) -> str:
         """Extract subdomain part"""
-        parts = self.domain.rstrip('.').split('.')
+        parts = self._parts
         if len(parts) <= 2:
             return ""
         return '.'.join(parts[:-2])
@@ -29,16 +43,15 @@ class DNSQuery:
     @property
     def base_domain(self) -> str:
         """Extract base domain (last two parts)"""
-        parts = self.domain.rstrip('.').split('.')
+        parts = self._parts
         if len(parts) >= 2:
             return '.'.join(parts[-2:])
-        return self.domain.rstrip('.')
+        return parts[0]
     
     @property
     def tld(self) -> str:
         """Extract top-level domain"""
-        parts = self.domain.rstrip('.').split('.')
-        return parts[-1] if parts else ""
+        return self._parts[-1]
     
     def __str__(self) -> str:
         return f"DNSQuery({self.domain} from {self.source_ip} at {self.timestamp})"
\ No newline at end of file
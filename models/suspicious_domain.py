@@ -1,23 +1,29 @@
+from collections import Counter
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Set, Dict, Optional
+from itertools import chain, islice
+from typing import Iterator, List, Set, Dict, Optional
 
+from ._compat import DATACLASS_SLOTS
 from .dns_query import DNSQuery
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class SuspiciousDomain:
     """
     Aggregates DNS activity and flags for a base domain detected as suspicious
     by early-stage filters. Subsequent analyzers can enrich this object with
     additional context and flags.
     """
+    _FLAG_CATEGORIES = ('statistical', 'string', 'set', 'semantic')
+
     base_domain: str
     first_seen: datetime
     last_seen: datetime
 
     total_queries: int = 0
     unique_subdomains: Set[str] = field(default_factory=set)
+    subdomain_counts: Dict[str, int] = field(default_factory=Counter)
     source_ips: Set[str] = field(default_factory=set)
 
     # Flags by category (e.g., 'statistical', 'string', 'set', 'semantic')
@@ -25,18 +31,30 @@ class SuspiciousDomain:
     string_flags: List[str] = field(default_factory=list)
     set_flags: List[str] = field(default_factory=list)
     semantic_flags: List[str] = field(default_factory=list)
+    # Flag names without their ':detail' suffix, across all categories
+    flag_prefixes: Set[str] = field(default_factory=set, repr=False)
 
-    # Raw queries retained for downstream analysis
-    queries: List[DNSQuery] = field(default_factory=list)
+    # Per-query columns, filled by add_query when the caller feeds raw queries
+    # (StatisticalFilter only hands over the aggregate fields above). Fields are
+    # parsed once here so analyzers never re-split a query's domain
+    query_timestamps: List[datetime] = field(default_factory=list)
+    query_source_ips: List[str] = field(default_factory=list)
+    query_subdomains: List[str] = field(default_factory=list)
+    query_tlds: List[str] = field(default_factory=list)
 
     # Optional scores by analyzer
     scores: Dict[str, float] = field(default_factory=dict)
 
     def add_query(self, query: DNSQuery) -> None:
-        self.queries.append(query)
         self.total_queries += 1
-        if query.subdomain:
-            self.unique_subdomains.add(query.subdomain)
+        subdomain = query.subdomain
+        self.query_timestamps.append(query.timestamp)
+        self.query_source_ips.append(query.source_ip)
+        self.query_subdomains.append(subdomain)
+        self.query_tlds.append(query.tld)
+        if subdomain:
+            self.unique_subdomains.add(subdomain)
+            self.subdomain_counts[subdomain] += 1
         self.source_ips.add(query.source_ip)
         # Maintain time bounds
         if query.timestamp < self.first_seen:
@@ -45,19 +63,20 @@ class SuspiciousDomain:
             self.last_seen = query.timestamp
 
     def add_flag(self, category: str, flag: str) -> None:
-        category_map = {
-            'statistical': self.statistical_flags,
-            'string': self.string_flags,
-            'set': self.set_flags,
-            'semantic': self.semantic_flags,
-        }
-        (category_map.get(category) or self.statistical_flags).append(flag)
+        # Unknown categories fall back to the statistical list
+        if category not in self._FLAG_CATEGORIES:
+            category = 'statistical'
+        getattr(self, f'{category}_flags').append(flag)
+        self.flag_prefixes.add(flag.split(':', 1)[0])
+
+    def subdomain_sample(self, limit: Optional[int] = None) -> List[str]:
+        """Up to `limit` distinct subdomains, in first-seen order when counts are kept"""
+        return list(islice(self.subdomain_counts or self.unique_subdomains, limit))
 
     @property
     def all_flags(self) -> List[str]:
-        flags = []
-        flags.extend(self.statistical_flags)
-        flags.extend(self.string_flags)
-        flags.extend(self.set_flags)
-        flags.extend(self.semantic_flags)
-        return flags
+        return list(self.iter_flags())
+
+    def iter_flags(self) -> Iterator[str]:
+        """Iterate over flags of every category without building a list"""
+        return chain(self.statistical_flags, self.string_flags, self.set_flags, self.semantic_flags)
@@ -2,8 +2,10 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 from datetime import datetime
 
+from ._compat import DATACLASS_SLOTS
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class WebsiteProfile:
     """
     Snapshot of a website/domain's externally observable properties
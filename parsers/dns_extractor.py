@@ -1,14 +1,42 @@
 import struct
 import socket
+import sys
+from functools import lru_cache
 from typing import List, Optional, Dict, Any
 from datetime import datetime
-import sys
-import os
 
-# Add models to path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from models.dns_query import DNSQuery
 
+# Wire formats, compiled once instead of re-parsing the format string per packet
+_ETH = struct.Struct('!6s6sH')
+_IPV4 = struct.Struct('!BBHHHBBH4s4s')
+_IPV6 = struct.Struct('!IHBB16s16s')
+_UDP = struct.Struct('!HHHH')
+_TCP = struct.Struct('!HHLLBBHHH')
+_DNS_HDR = struct.Struct('!HHHHHH')
+_U16 = struct.Struct('!H')
+_QTYPE_QCLASS = struct.Struct('!HH')
+_PORTS = struct.Struct('!HH')
+
+# Query type names indexed by type number; unnamed types read 'TYPE<n>'
+_QUERY_TYPE_NAMES = ['TYPE%d' % i for i in range(256)]
+for _number, _name in ((1, 'A'), (2, 'NS'), (5, 'CNAME'), (6, 'SOA'), (12, 'PTR'), (15, 'MX'),
+                       (16, 'TXT'), (28, 'AAAA'), (33, 'SRV'), (255, 'ANY')):
+    _QUERY_TYPE_NAMES[_number] = _name
+_QUERY_TYPE_NAMES = tuple(sys.intern(name) for name in _QUERY_TYPE_NAMES)
+del _number, _name
+
+
+@lru_cache(maxsize=8192)
+def _ip_to_str(packed: bytes) -> str:
+    """
+    Format a packed IPv4 (4-byte) or IPv6 (16-byte) address. A capture has
+    few distinct DNS endpoints, so nearly every call is a cache hit.
+    """
+    if len(packed) == 4:
+        return socket.inet_ntoa(packed)
+    return socket.inet_ntop(socket.AF_INET6, packed)
+
 class DNSExtractor:
     """Extract DNS queries from network packets"""
     
@@ -44,12 +72,13 @@ class DNSExtractor:
             if packet['link_type'] != 1:
                 return []
             
-            data = packet['data']
+            # Zero-copy view; each layer below slices it without copying bytes
+            data = memoryview(packet['data'])
             if len(data) < 14:  # Minimum Ethernet header
                 return []
             
             # Parse Ethernet header
-            eth_header = struct.unpack('!6s6sH', data[:14])
+            eth_header = _ETH.unpack_from(data, 0)
             eth_type = eth_header[2]
             
             if eth_type == self.ETHERTYPE_IP:
@@ -63,7 +92,7 @@ class DNSExtractor:
             self.stats['parse_errors'] += 1
             return []
     
-    def _extract_from_ipv4(self, packet: Dict[str, Any], ip_data: bytes) -> List[DNSQuery]:
+    def _extract_from_ipv4(self, packet: Dict[str, Any], ip_data: memoryview) -> List[DNSQuery]:
         """Extract DNS from IPv4 packet"""
         if len(ip_data) < 20:  # Minimum IP header
             return []
@@ -71,13 +100,16 @@ class DNSExtractor:
         self.stats['ip_packets'] += 1
         
         # Parse IP header
-        ip_header = struct.unpack('!BBHHHBBH4s4s', ip_data[:20])
+        ip_header = _IPV4.unpack_from(ip_data, 0)
         version_ihl = ip_header[0]
         ihl = (version_ihl & 0x0F) * 4  # Internet Header Length
         protocol = ip_header[6]
-        src_ip = socket.inet_ntoa(ip_header[8])
-        dst_ip = socket.inet_ntoa(ip_header[9])
+        # Raw 4-byte addresses; only stringified once a DNS query is built
+        src_ip = ip_header[8]
+        dst_ip = ip_header[9]
         
+        if self._skip_non_dns(protocol, ip_data, ihl):
+            return []
         if protocol == self.IPPROTO_UDP:
             return self._extract_from_udp(packet, ip_data[ihl:], src_ip, dst_ip)
         elif protocol == self.IPPROTO_TCP:
@@ -85,7 +117,7 @@ class DNSExtractor:
         
         return []
     
-    def _extract_from_ipv6(self, packet: Dict[str, Any], ip_data: bytes) -> List[DNSQuery]:
+    def _extract_from_ipv6(self, packet: Dict[str, Any], ip_data: memoryview) -> List[DNSQuery]:
         """Extract DNS from IPv6 packet (simplified)"""
         if len(ip_data) < 40:  # Minimum IPv6 header
             return []
@@ -93,11 +125,13 @@ class DNSExtractor:
         self.stats['ip_packets'] += 1
         
         # Parse IPv6 header (simplified - ignoring extension headers)
-        ip_header = struct.unpack('!IHBB16s16s', ip_data[:40])
+        ip_header = _IPV6.unpack_from(ip_data, 0)
         next_header = ip_header[2]
-        src_ip = socket.inet_ntop(socket.AF_INET6, ip_header[4])
-        dst_ip = socket.inet_ntop(socket.AF_INET6, ip_header[5])
+        src_ip = ip_header[4]
+        dst_ip = ip_header[5]
         
+        if self._skip_non_dns(next_header, ip_data, 40):
+            return []
         if next_header == self.IPPROTO_UDP:
             return self._extract_from_udp(packet, ip_data[40:], src_ip, dst_ip)
         elif next_header == self.IPPROTO_TCP:
@@ -105,7 +139,29 @@ class DNSExtractor:
         
         return []
     
-    def _extract_from_udp(self, packet: Dict[str, Any], udp_data: bytes, src_ip: str, dst_ip: str) -> List[DNSQuery]:
+    def _skip_non_dns(self, protocol: int, ip_data: memoryview, offset: int) -> bool:
+        """
+        Peek at the transport ports and report whether the packet can be
+        dropped without a full UDP/TCP parse. Counts it in the same
+        transport statistic the full parse would have.
+        """
+        if protocol == self.IPPROTO_UDP:
+            if len(ip_data) < offset + 8:
+                return False
+            counter = 'udp_packets'
+        elif protocol == self.IPPROTO_TCP:
+            if len(ip_data) < offset + 20:
+                return False
+            counter = 'tcp_packets'
+        else:
+            return False
+        src_port, dst_port = _PORTS.unpack_from(ip_data, offset)
+        if src_port == self.DNS_PORT or dst_port == self.DNS_PORT:
+            return False
+        self.stats[counter] += 1
+        return True
+    
+    def _extract_from_udp(self, packet: Dict[str, Any], udp_data: memoryview, src_ip: bytes, dst_ip: bytes) -> List[DNSQuery]:
         """Extract DNS from UDP packet"""
         if len(udp_data) < 8:  # Minimum UDP header
             return []
@@ -113,7 +169,7 @@ class DNSExtractor:
         self.stats['udp_packets'] += 1
         
         # Parse UDP header
-        udp_header = struct.unpack('!HHHH', udp_data[:8])
+        udp_header = _UDP.unpack_from(udp_data, 0)
         src_port = udp_header[0]
         dst_port = udp_header[1]
         
@@ -124,7 +180,7 @@ class DNSExtractor:
         
         return []
     
-    def _extract_from_tcp(self, packet: Dict[str, Any], tcp_data: bytes, src_ip: str, dst_ip: str) -> List[DNSQuery]:
+    def _extract_from_tcp(self, packet: Dict[str, Any], tcp_data: memoryview, src_ip: bytes, dst_ip: bytes) -> List[DNSQuery]:
         """Extract DNS from TCP packet (DNS over TCP)"""
         if len(tcp_data) < 20:  # Minimum TCP header
             return []
@@ -132,7 +188,7 @@ class DNSExtractor:
         self.stats['tcp_packets'] += 1
         
         # Parse TCP header
-        tcp_header = struct.unpack('!HHLLBBHHH', tcp_data[:20])
+        tcp_header = _TCP.unpack_from(tcp_data, 0)
         src_port = tcp_header[0]
         dst_port = tcp_header[1]
         data_offset = (tcp_header[4] >> 4) * 4
@@ -142,115 +198,131 @@ class DNSExtractor:
             self.stats['dns_packets'] += 1
             # TCP DNS messages are prefixed with 2-byte length
             if len(tcp_data) > data_offset + 2:
-                dns_length = struct.unpack('!H', tcp_data[data_offset:data_offset+2])[0]
+                dns_length = _U16.unpack_from(tcp_data, data_offset)[0]
                 dns_data = tcp_data[data_offset+2:data_offset+2+dns_length]
                 return self._parse_dns_message(packet, dns_data, src_ip, dst_ip)
         
         return []
     
-    def _parse_dns_message(self, packet: Dict[str, Any], dns_data: bytes, src_ip: str, dst_ip: str) -> List[DNSQuery]:
-        """Parse DNS message and extract queries"""
+    def _parse_dns_message(self, packet: Dict[str, Any], dns_data: memoryview, src_ip: bytes, dst_ip: bytes) -> List[DNSQuery]:
+        """Parse DNS message and extract queries; src_ip/dst_ip are packed addresses"""
         if len(dns_data) < 12:  # Minimum DNS header
             return []
         
-        queries = []
+        # Parse DNS header
+        dns_header = _DNS_HDR.unpack_from(dns_data, 0)
+        flags = dns_header[1]
+        questions = dns_header[2]
         
-        try:
-            # Parse DNS header
-            dns_header = struct.unpack('!HHHHHH', dns_data[:12])
-            transaction_id = dns_header[0]
-            flags = dns_header[1]
-            questions = dns_header[2]
-            answers = dns_header[3]
-            authority = dns_header[4]
-            additional = dns_header[5]
-            
-            # Check if this is a query (QR bit = 0)
-            is_query = (flags & 0x8000) == 0
-            
-            if is_query and questions > 0:
-                # Parse questions section
-                offset = 12
-                for _ in range(questions):
-                    domain, query_type, offset = self._parse_dns_question(dns_data, offset)
-                    if domain:
-                        query = DNSQuery(
-                            domain=domain,
-                            timestamp=packet['timestamp'],
-                            source_ip=src_ip,
-                            query_type=self._get_query_type_name(query_type),
-                            destination_ip=dst_ip
-                        )
-                        queries.append(query)
-                        self.stats['dns_queries'] += 1
+        # Only queries (QR bit = 0) with a question section are of interest
+        if flags & 0x8000 or not questions:
+            return []
         
-        except Exception:
-            self.stats['parse_errors'] += 1
+        queries = []
+        timestamp = None
+        # Parse questions section
+        offset = 12
+        for _ in range(questions):
+            domain, query_type, offset = self._parse_dns_question(dns_data, offset)
+            if query_type is None:
+                # Malformed question; the offset did not advance, so the
+                # remaining questions would fail the same way
+                break
+            if domain:
+                if timestamp is None:
+                    timestamp = self._packet_datetime(packet)
+                    src_ip = _ip_to_str(src_ip)
+                    dst_ip = _ip_to_str(dst_ip)
+                query = DNSQuery(
+                    domain=domain,
+                    timestamp=timestamp,
+                    source_ip=src_ip,
+                    query_type=self._get_query_type_name(query_type),
+                    destination_ip=dst_ip
+                )
+                queries.append(query)
+                self.stats['dns_queries'] += 1
         
         return queries
     
-    def _parse_dns_question(self, dns_data: bytes, offset: int) -> tuple:
-        """Parse a DNS question and return (domain, query_type, new_offset)"""
-        domain = ""
+    def _parse_dns_question(self, dns_data: memoryview, offset: int) -> tuple:
+        """
+        Parse a DNS question and return (domain, query_type, new_offset).
+        Compression pointers are followed iteratively; a truncated name or a
+        pointer loop is malformed and yields (None, None, offset).
+        """
         original_offset = offset
+        labels = []
+        resume = None  # offset just past the first compression pointer
+        visited = None
         
-        try:
-            # Parse domain name
-            while offset < len(dns_data):
-                length = dns_data[offset]
-                offset += 1
-                
-                if length == 0:
-                    break
-                elif (length & 0xC0) == 0xC0:
-                    # Compression pointer
-                    if offset >= len(dns_data):
-                        break
-                    pointer = ((length & 0x3F) << 8) | dns_data[offset]
-                    offset += 1
-                    compressed_domain, _, _ = self._parse_dns_question(dns_data, pointer)
-                    domain += compressed_domain
-                    break
-                else:
-                    # Regular label
-                    if offset + length > len(dns_data):
-                        break
-                    if domain:
-                        domain += "."
-                    domain += dns_data[offset:offset+length].decode('utf-8', errors='ignore')
-                    offset += length
+        # Parse domain name; labels are joined once at the end
+        end = len(dns_data)
+        while True:
+            if offset >= end:
+                return None, None, original_offset
+            length = dns_data[offset]
+            offset += 1
             
-            # Parse query type and class
-            if offset + 4 <= len(dns_data):
-                query_type, query_class = struct.unpack('!HH', dns_data[offset:offset+4])
-                offset += 4
-                return domain, query_type, offset
-            
-        except Exception:
-            pass
+            if length == 0:
+                break
+            elif (length & 0xC0) == 0xC0:
+                # Compression pointer: continue reading labels at its target
+                if offset >= end:
+                    return None, None, original_offset
+                pointer = ((length & 0x3F) << 8) | dns_data[offset]
+                if resume is None:
+                    resume = offset + 1
+                    visited = set()
+                elif pointer in visited:
+                    return None, None, original_offset
+                visited.add(pointer)
+                offset = pointer
+            else:
+                # Regular label
+                if offset + length > end:
+                    return None, None, original_offset
+                labels.append(str(dns_data[offset:offset+length], 'utf-8', 'ignore'))
+                offset += length
+        
+        if resume is not None:
+            offset = resume
+        if labels and not labels[0]:
+            # Labels that decode to nothing before the first visible one
+            # add no separator
+            labels = labels[next((i for i, label in enumerate(labels) if label), len(labels)):]
+        domain = '.'.join(labels)
+        
+        # Parse query type and class
+        if offset + 4 <= end:
+            query_type, query_class = _QTYPE_QCLASS.unpack_from(dns_data, offset)
+            return domain, query_type, offset + 4
         
         return None, None, original_offset
     
+    @staticmethod
+    def _packet_datetime(packet: Dict[str, Any]) -> datetime:
+        """Packet timestamps arrive as epoch seconds from PCAPParser; accept datetimes too"""
+        timestamp = packet['timestamp']
+        if isinstance(timestamp, datetime):
+            return timestamp
+        return datetime.fromtimestamp(timestamp)
+    
     def _get_query_type_name(self, query_type: int) -> str:
         """Convert query type number to name"""
-        type_names = {
-            1: 'A',
-            2: 'NS',
-            5: 'CNAME',
-            6: 'SOA',
-            12: 'PTR',
-            15: 'MX',
-            16: 'TXT',
-            28: 'AAAA',
-            33: 'SRV',
-            255: 'ANY'
-        }
-        return type_names.get(query_type, f'TYPE{query_type}')
+        if query_type < 256:
+            return _QUERY_TYPE_NAMES[query_type]
+        return f'TYPE{query_type}'
     
     def get_statistics(self) -> Dict[str, int]:
         """Get extraction statistics"""
         return self.stats.copy()
     
+    def merge_statistics(self, stats: Dict[str, int]):
+        """Add counts gathered by another extractor, e.g. a worker process"""
+        for key, value in stats.items():
+            self.stats[key] = self.stats.get(key, 0) + value
+    
     def reset_statistics(self):
         """Reset extraction statistics"""
         self.stats = {
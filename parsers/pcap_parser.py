@@ -1,6 +1,6 @@
+import mmap
 import struct
-from datetime import datetime
-from typing import Iterator, Dict, Any
+from typing import Iterator, Dict, Any, List, Optional, Tuple
 import os
 
 class PCAPParser:
@@ -8,90 +8,140 @@ class PCAPParser:
     
     def __init__(self, pcap_file: str):
         self.pcap_file = pcap_file
-        self.file_handle = None
         self.header_parsed = False
         self.link_type = None
+        # Read-only mapping of the capture; packets are handed out as
+        # zero-copy memoryview slices of it, tracked by a byte cursor
+        self._mmap = None
+        self._view = None
+        self._offset = 0
         
     def __enter__(self):
-        self.file_handle = open(self.pcap_file, 'rb')
+        with open(self.pcap_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < 24:
+                raise ValueError("Invalid PCAP file - header too short")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        self._offset = 0
         self._parse_global_header()
         return self
         
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.file_handle:
-            self.file_handle.close()
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # A caller still holds packet data; the mapping is unmapped
+                # once the last of those views is released
+                pass
+            self._mmap = None
     
     def _parse_global_header(self):
         """Parse PCAP global header"""
-        if not self.file_handle:
+        if self._view is None:
             raise RuntimeError("File not opened")
             
-        header = self.file_handle.read(24)
+        header = self._view[:24]
         if len(header) < 24:
             raise ValueError("Invalid PCAP file - header too short")
         
-        # Check magic number to determine endianness
-        magic = struct.unpack('I', header[:4])[0]
-        if magic == 0xa1b2c3d4:
+        # Check the magic number's byte order to determine the file's endianness
+        magic = bytes(header[:4])
+        if magic == b'\xa1\xb2\xc3\xd4':
             # Big endian
             self.endian = '>'
-        elif magic == 0xd4c3b2a1:
+        elif magic == b'\xd4\xc3\xb2\xa1':
             # Little endian
             self.endian = '<'
         else:
-            raise ValueError(f"Invalid PCAP magic number: {hex(magic)}")
+            raise ValueError(f"Invalid PCAP magic number: {magic.hex()}")
         
         # Parse rest of header
-        format_str = f"{self.endian}HHIIII"
-        _, _, _, _, _, link_type = struct.unpack(format_str, header[4:])
+        _, _, _, _, _, link_type = struct.unpack_from(f"{self.endian}HHIIII", header, 4)
         self.link_type = link_type
+        # Per-packet record header, compiled once for the file's byte order
+        self._packet_header = struct.Struct(f"{self.endian}IIII")
+        self._offset = 24
         self.header_parsed = True
     
-    def parse_packets(self) -> Iterator[Dict[str, Any]]:
-        """Generator that yields parsed packets"""
+    def parse_packets(self, start_offset: Optional[int] = None, end_offset: Optional[int] = None,
+                      first_packet_id: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        Generator that yields parsed packets. Packet 'data' is a read-only
+        memoryview into the mapped file, valid while the parser is open.
+        start_offset/end_offset restrict parsing to records in that byte
+        range (see chunk_ranges); by default parsing continues from the
+        current position to the end of the file.
+        """
         if not self.header_parsed:
             raise RuntimeError("Global header not parsed")
         
-        packet_count = 0
-        while True:
-            try:
-                packet = self._parse_packet()
-                if packet is None:
-                    break
-                packet['packet_id'] = packet_count
-                packet_count += 1
-                yield packet
-            except struct.error:
-                # End of file or corrupted data
+        if start_offset is not None:
+            self._offset = start_offset
+        view = self._view
+        if view is None:
+            return
+        
+        # Record headers are walked inline with locals bound once, avoiding a
+        # method call and attribute loads per packet
+        unpack_header = self._packet_header.unpack_from
+        link_type = self.link_type
+        size = len(view)
+        limit = size if end_offset is None else min(end_offset, size)
+        offset = self._offset
+        packet_id = first_packet_id
+        while offset < limit:
+            data_start = offset + 16
+            if data_start > size:
                 break
+            ts_sec, ts_usec, caplen, wirelen = unpack_header(view, offset)
+            data_end = data_start + caplen
+            if data_end > size:
+                # Truncated final record
+                break
+            self._offset = offset = data_end
+            yield {
+                # Epoch seconds; consumers build a datetime only for packets they keep
+                'timestamp': ts_sec + ts_usec / 1000000.0,
+                'captured_length': caplen,
+                'original_length': wirelen,
+                'data': view[data_start:data_end],
+                'link_type': link_type,
+                'packet_id': packet_id,
+            }
+            packet_id += 1
     
-    def _parse_packet(self) -> Dict[str, Any]:
-        """Parse a single packet"""
-        if not self.file_handle:
-            return None
-            
-        # Read packet header (16 bytes)
-        packet_header = self.file_handle.read(16)
-        if len(packet_header) < 16:
-            return None
-        
-        format_str = f"{self.endian}IIII"
-        ts_sec, ts_usec, caplen, wirelen = struct.unpack(format_str, packet_header)
-        
-        # Read packet data
-        packet_data = self.file_handle.read(caplen)
-        if len(packet_data) < caplen:
-            return None
-        
-        timestamp = datetime.fromtimestamp(ts_sec + ts_usec / 1000000.0)
+    def chunk_ranges(self, chunks: int) -> List[Tuple[int, int, int]]:
+        """
+        Split the records after the global header into about `chunks` byte
+        ranges of similar size, cut at record boundaries. Returns
+        (start_offset, end_offset, first_packet_id) tuples for parse_packets.
+        Only record headers are read.
+        """
+        if not self.header_parsed:
+            raise RuntimeError("Global header not parsed")
         
-        return {
-            'timestamp': timestamp,
-            'captured_length': caplen,
-            'original_length': wirelen,
-            'data': packet_data,
-            'link_type': self.link_type
-        }
+        size = len(self._view)
+        target = max(1, (size - 24) // max(1, chunks))
+        header = self._packet_header
+        ranges = []
+        start = offset = 24
+        start_id = packet_id = 0
+        while offset + 16 <= size:
+            caplen = header.unpack_from(self._view, offset)[2]
+            if offset + 16 + caplen > size:
+                break
+            offset += 16 + caplen
+            packet_id += 1
+            if offset - start >= target:
+                ranges.append((start, offset, start_id))
+                start, start_id = offset, packet_id
+        if offset > start:
+            ranges.append((start, offset, start_id))
+        return ranges
     
     def get_stats(self) -> Dict[str, Any]:
         """Get basic statistics about the PCAP file"""
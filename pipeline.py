@@ -1,5 +1,9 @@
 import logging
-from typing import Dict, Any, List
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Any, Iterator, List, Tuple
 
 from parsers.pcap_parser import PCAPParser
 from parsers.dns_extractor import DNSExtractor
@@ -11,6 +15,78 @@ from utils.web_utils import WebAnalyzer
 
 logger = logging.getLogger(__name__)
 
+# Captures smaller than this are extracted in-process; below it the cost of
+# pickling queries back from workers outweighs the parallel speedup.
+_PARALLEL_EXTRACT_MIN_BYTES = 32 * 1024 * 1024
+
+
+def _extract_range(pcap_path: str, start: int, end: int, first_packet_id: int) -> Tuple[List[Any], Dict[str, int]]:
+    """Worker: extract DNS queries from one byte range of a capture"""
+    extractor = DNSExtractor()
+    queries = []
+    with PCAPParser(pcap_path) as parser:
+        for pkt in parser.parse_packets(start, end, first_packet_id):
+            queries.extend(extractor.extract_dns_from_packet(pkt))
+    return queries, extractor.get_statistics()
+
+
+def _stream_queries(pcap_path: str, extractor: DNSExtractor, workers: int) -> Iterator[Any]:
+    """
+    Yield DNS queries from a capture as packets are parsed, so the full query
+    list is never held in memory. Large captures are split into chunks at
+    record boundaries and extracted by a process pool; chunks are yielded in
+    order so the stream matches a sequential run. On that path each chunk's
+    queries arrive as one list, so up to about `workers` + 1 chunks (roughly
+    (workers + 1) / (4 * workers) of the capture's queries) are held at once.
+    """
+    with PCAPParser(pcap_path) as parser:
+        if workers > 1 and os.path.getsize(pcap_path) >= _PARALLEL_EXTRACT_MIN_BYTES:
+            ranges = parser.chunk_ranges(workers * 4)
+        else:
+            ranges = []
+        if len(ranges) < 2:
+            for pkt in parser.parse_packets():
+                yield from extractor.extract_dns_from_packet(pkt)
+            return
+
+    # Keep only `workers` chunks in flight, submitting the next as each is
+    # consumed, so finished chunks do not pile up behind a slow earlier one
+    pending_ranges = iter(ranges)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque(pool.submit(_extract_range, pcap_path, *r) for r in islice(pending_ranges, workers))
+        while in_flight:
+            chunk_queries, stats = in_flight.popleft().result()
+            for r in islice(pending_ranges, 1):
+                in_flight.append(pool.submit(_extract_range, pcap_path, *r))
+            extractor.merge_statistics(stats)
+            yield from chunk_queries
+            del chunk_queries
+
+
+def _collect_web_profile(web: WebAnalyzer, domain: str) -> Dict[str, Any]:
+    """Run the accessibility/SSL/WHOIS/metadata checks for one domain"""
+    web_profile = {
+        **web.check_domain_accessibility(domain),
+        **{'valid_ssl': False, 'name_servers': [], 'age_days': None, 'privacy_protected': False},
+        'blacklist': web.check_blacklist_status(domain),
+    }
+    ssl_info = web.get_ssl_certificate_info(domain)
+    if ssl_info:
+        web_profile['valid_ssl'] = bool(ssl_info.get('valid_ssl'))
+    whois_info = web.get_whois_info(domain)
+    if whois_info:
+        web_profile['name_servers'] = whois_info.get('name_servers') or []
+        web_profile['age_days'] = whois_info.get('age_days')
+        web_profile['privacy_protected'] = bool(whois_info.get('privacy_protected'))
+    # rough content length from metadata if accessible
+    if web_profile.get('http_accessible') or web_profile.get('https_accessible'):
+        try:
+            meta = web.extract_page_metadata((web_profile.get('final_url') or f"https://{domain}"))
+            web_profile['content_length'] = meta.get('content_length', 0)
+        except Exception:
+            web_profile['content_length'] = 0
+    return web_profile
+
 
 def run_pcap_pipeline(pcap_path: str, config: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -18,6 +94,8 @@ def run_pcap_pipeline(pcap_path: str, config: Dict[str, Any]) -> Dict[str, Any]:
     -> Web checks (optional) -> Intelligence scoring -> Report
     """
     enable_web = bool(config.get("pipeline", {}).get("enable_web_checks", False))
+    web_workers = int(config.get("pipeline", {}).get("web_workers", 10))
+    extract_workers = int(config.get("pipeline", {}).get("extract_workers") or os.cpu_count() or 1)
 
     # Initialize components
     extractor = DNSExtractor()
@@ -32,16 +110,10 @@ def run_pcap_pipeline(pcap_path: str, config: Dict[str, Any]) -> Dict[str, Any]:
     if thresholds:
         stat_filter.update_thresholds(thresholds)
 
-    # 1) Parse PCAP and extract DNS queries
-    queries = []
+    # 1-2) Parse PCAP and stream the extracted DNS queries into the statistical filter
     logger.info(f"Reading PCAP: %s", pcap_path)
-    with PCAPParser(pcap_path) as parser:
-        for pkt in parser.parse_packets():
-            queries.extend(extractor.extract_dns_from_packet(pkt))
-    logger.info("Extracted %d DNS queries", len(queries))
-
-    # 2) Run statistical filter
-    suspicious_domains = stat_filter.process_dns_queries(queries)
+    suspicious_domains = stat_filter.process_dns_queries(_stream_queries(pcap_path, extractor, extract_workers))
+    logger.info("Extracted %d DNS queries", extractor.get_statistics()['dns_queries'])
     logger.info("Statistical filter flagged %d domains", len(suspicious_domains))
 
     # 3) String and Set analyzers
@@ -49,45 +121,34 @@ def run_pcap_pipeline(pcap_path: str, config: Dict[str, Any]) -> Dict[str, Any]:
         str_analyzer.analyze(item)
         set_analyzer.analyze(item)
 
-    # 4) Prepare analysis data for Intelligence
+    # 4) Optional web checks; network-bound, so fan out across threads that
+    #    share one WebAnalyzer session, closed once all checks are done
+    web_profiles: Dict[str, Dict[str, Any]] = {}
+    if web is not None:
+        domains = [item.base_domain for item in suspicious_domains]
+        with web, ThreadPoolExecutor(max_workers=web_workers) as pool:
+            web_profiles = dict(zip(domains, pool.map(lambda d: _collect_web_profile(web, d), domains)))
+
+    # 5) Prepare analysis data for Intelligence
     results: Dict[str, Dict[str, Any]] = {}
     for item in suspicious_domains:
         domain = item.base_domain
+        # Intelligence only reads the flag lists, and analysis is finished
+        # by now, so they are passed by reference rather than copied
         analysis_data: Dict[str, Any] = {
-            'statistical_flags': list(item.statistical_flags),
-            'string_patterns': list(item.string_flags),
-            'set_analysis': list(item.set_flags),
-            'semantic_analysis': list(item.semantic_flags),
+            'statistical_flags': item.statistical_flags,
+            'string_patterns': item.string_flags,
+            'set_analysis': item.set_flags,
+            'semantic_analysis': item.semantic_flags,
             'website_history': {},
         }
 
-        # Optional web checks
-        if web is not None:
-            web_profile = {
-                **web.check_domain_accessibility(domain),
-                **{'valid_ssl': False, 'name_servers': [], 'age_days': None, 'privacy_protected': False},
-                'blacklist': web.check_blacklist_status(domain),
-            }
-            ssl_info = web.get_ssl_certificate_info(domain)
-            if ssl_info:
-                web_profile['valid_ssl'] = bool(ssl_info.get('valid_ssl'))
-            whois_info = web.get_whois_info(domain)
-            if whois_info:
-                web_profile['name_servers'] = whois_info.get('name_servers') or []
-                web_profile['age_days'] = whois_info.get('age_days')
-                web_profile['privacy_protected'] = bool(whois_info.get('privacy_protected'))
-            # rough content length from metadata if accessible
-            if web_profile.get('http_accessible') or web_profile.get('https_accessible'):
-                try:
-                    meta = web.extract_page_metadata((web_profile.get('final_url') or f"https://{domain}"))
-                    web_profile['content_length'] = meta.get('content_length', 0)
-                except Exception:
-                    web_profile['content_length'] = 0
-            analysis_data['web_crawl_results'] = web_profile
+        if domain in web_profiles:
+            analysis_data['web_crawl_results'] = web_profiles[domain]
 
         results[domain] = brain.analyze_domain(domain, analysis_data)
 
-    # 5) Final report
+    # 6) Final report
     report = brain.generate_report()
     report['extractor_stats'] = extractor.get_statistics()
     report['filter_stats'] = stat_filter.get_statistics()
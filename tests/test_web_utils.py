@@ -0,0 +1,57 @@
+import http.server
+import threading
+import unittest
+
+from utils.web_utils import WebAnalyzer
+
+
+PAGE = b'<html><head><title>Hello</title></head><body><a href="/next">next</a></body></html>'
+
+
+class _PageHandler(http.server.BaseHTTPRequestHandler):
+    # path -> Content-Type header, None for no header at all
+    CONTENT_TYPES = {
+        '/html': 'text/html; charset=utf-8',
+        '/xhtml': 'application/xhtml+xml',
+        '/untyped': None,
+    }
+
+    def do_GET(self):
+        self.send_response(200)
+        content_type = self.CONTENT_TYPES[self.path]
+        if content_type:
+            self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+class ExtractPageMetadataTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _PageHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f'http://127.0.0.1:{cls.server.server_port}'
+        cls.web = WebAnalyzer(timeout=5)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.web.close()
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_metadata_without_text_charset(self):
+        for path in _PageHandler.CONTENT_TYPES:
+            with self.subTest(path=path):
+                meta = self.web.extract_page_metadata(self.base + path)
+                self.assertIsNone(meta['error'])
+                self.assertEqual(meta['title'], 'Hello')
+                self.assertEqual(meta['links'], [self.base + '/next'])
+                self.assertEqual(meta['content_length'], len(PAGE))
+
+
+if __name__ == '__main__':
+    unittest.main()
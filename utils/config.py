@@ -12,6 +12,8 @@ def load_config(config_path: str = None) -> Dict[str, Any]:
         "pipeline": {
             "enable_web_checks": False,
             "max_domains_for_web_checks": 25,
+            "web_workers": 10,
+            "extract_workers": None,
         },
         "statistical_thresholds": {
             "frequency_per_minute": 10,
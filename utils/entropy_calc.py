@@ -1,19 +1,34 @@
 import math
 from collections import Counter
+from functools import lru_cache
 from typing import List
 
+# c * log2(c) for every character count a DNS name can produce (labels and
+# names are capped well below 256), so entropy needs no per-call log2 there.
+# H = log2(n) - sum(c * log2(c)) / n
+_C_LOG2_C_SIZE = 256
+_C_LOG2_C = [0.0] + [c * math.log2(c) for c in range(1, _C_LOG2_C_SIZE)]
+
+@lru_cache(maxsize=200_000)
 def calculate_shannon_entropy(text: str) -> float:
     """
     Calculate Shannon entropy for a string
     Higher entropy indicates more randomness/unpredictability
+    Cached here only; the domain/subdomain wrappers share this cache
     """
     if not text:
         return 0.0
     
-    # Count character frequencies
-    char_counts = Counter(text.lower())
+    # Count character frequencies; the only lowercasing on any entropy path.
+    # Length is taken after lowering so counts always sum to it
+    text = text.lower()
+    char_counts = Counter(text)
     text_length = len(text)
     
+    # Fast path: lowercasing ASCII keeps the length, so counts sum to n
+    if text_length < _C_LOG2_C_SIZE and text.isascii():
+        return math.log2(text_length) - sum(_C_LOG2_C[c] for c in char_counts.values()) / text_length
+    
     # Calculate entropy
     entropy = 0.0
     for count in char_counts.values():
@@ -28,9 +43,8 @@ def calculate_domain_entropy(domain: str) -> float:
     Calculate entropy specifically for domain names
     Removes dots and focuses on subdomain entropy
     """
-    # Remove dots and convert to lowercase
-    clean_domain = domain.replace('.', '').lower()
-    return calculate_shannon_entropy(clean_domain)
+    # Remove dots; calculate_shannon_entropy lowercases
+    return calculate_shannon_entropy(domain.replace('.', ''))
 
 def calculate_subdomain_entropy(subdomain: str) -> float:
     """
@@ -38,7 +52,7 @@ def calculate_subdomain_entropy(subdomain: str) -> float:
     """
     if not subdomain:
         return 0.0
-    return calculate_shannon_entropy(subdomain.lower())
+    return calculate_shannon_entropy(subdomain)
 
 def entropy_analysis(domains: List[str]) -> dict:
     """
@@ -54,9 +68,10 @@ def entropy_analysis(domains: List[str]) -> dict:
             'high_entropy_threshold': 4.0
         }
     
-    entropies = [calculate_domain_entropy(domain) for domain in domains]
+    # map() keeps both per-domain loops in C; True sums as 1
+    entropies = list(map(calculate_domain_entropy, domains))
     high_entropy_threshold = 4.0
-    high_entropy_count = sum(1 for e in entropies if e > high_entropy_threshold)
+    high_entropy_count = sum(map(high_entropy_threshold.__lt__, entropies))
     
     return {
         'count': len(domains),
@@ -79,7 +94,8 @@ def entropy_score_domain(domain: str) -> dict:
     """
     Comprehensive entropy scoring for a domain
     """
-    parts = domain.lower().split('.')
+    # Component entropies lowercase internally
+    parts = domain.split('.')
     
     scores = {
         'full_domain': calculate_domain_entropy(domain),
@@ -1,9 +1,9 @@
 import random
 import time
 import threading
-from typing import List, Dict, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
-import queue
 
 @dataclass
 class ProxyConfig:
@@ -12,6 +12,18 @@ class ProxyConfig:
     https_proxies: List[str]
     rotation_interval: int = 300  # seconds
 
+# Headers sent on every request; the empty slots keep header order and are
+# filled per request by get_stealth_headers
+_BASE_STEALTH_HEADERS = {
+    'User-Agent': '',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': '',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
 class StealthCrawler:
     """Anti-detection tools for web crawling"""
     
@@ -38,31 +50,33 @@ class StealthCrawler:
         self.request_count = 0
         self.last_request_time = 0
         
+        # Private generator with bound methods, so per-request draws skip module lookups
+        self._rng = random.Random()
+        self._choice = self._rng.choice
+        self._random = self._rng.random
+        self._uniform = self._rng.uniform
+        self._randint = self._rng.randint
+        
     def get_random_user_agent(self) -> str:
         """Get a random user agent string"""
-        return random.choice(self.user_agents)
+        return self._choice(self.user_agents)
     
     def get_random_accept_language(self) -> str:
         """Get a random accept language header"""
-        return random.choice(self.accept_languages)
+        return self._choice(self.accept_languages)
     
     def get_stealth_headers(self) -> Dict[str, str]:
         """Generate realistic HTTP headers"""
-        headers = {
-            'User-Agent': self.get_random_user_agent(),
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': self.get_random_accept_language(),
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        }
+        # Copy the fixed headers, then fill the two rotating slots in place
+        headers = dict(_BASE_STEALTH_HEADERS)
+        headers['User-Agent'] = self._choice(self.user_agents)
+        headers['Accept-Language'] = self._choice(self.accept_languages)
         
         # Randomly add some additional headers
-        if random.random() < 0.3:
+        if self._random() < 0.3:
             headers['Cache-Control'] = 'no-cache'
         
-        if random.random() < 0.2:
+        if self._random() < 0.2:
             headers['Pragma'] = 'no-cache'
         
         return headers
@@ -70,7 +84,7 @@ class StealthCrawler:
     def calculate_delay(self, base_delay: float = 1.0, jitter: float = 0.5) -> float:
         """Calculate delay with jitter to avoid detection"""
         # Add random jitter
-        jitter_amount = random.uniform(-jitter, jitter)
+        jitter_amount = self._uniform(-jitter, jitter)
         delay = base_delay + jitter_amount
         
         # Ensure minimum delay
@@ -113,104 +127,137 @@ class StealthCrawler:
     
     def get_random_timeout(self, base_timeout: int = 10) -> int:
         """Get randomized timeout value"""
-        return base_timeout + random.randint(-2, 5)
+        return base_timeout + self._randint(-2, 5)
+
+class _RateLimiter:
+    """
+    Spaces calls at least 60 / requests_per_minute seconds apart across all
+    threads. Each caller reserves the next free slot under the lock, then
+    sleeps outside it, so waiting workers never hold each other up.
+    """
+    
+    def __init__(self, requests_per_minute: int):
+        self.interval = 60.0 / requests_per_minute
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
 
 class RequestQueue:
     """Queue system for managing crawl requests with delays"""
     
     def __init__(self, max_workers: int = 3, requests_per_minute: int = 10):
-        self.queue = queue.Queue()
         self.max_workers = max_workers
         self.requests_per_minute = requests_per_minute
-        self.workers = []
         self.stealth_crawler = StealthCrawler()
-        self.results = {}
-        self.running = False
+        self._limiter = _RateLimiter(requests_per_minute)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pending: List[Tuple[Dict, Future]] = []  # requests added before start()
+        self.results: Dict[str, object] = {}  # latest callback result per URL
     
-    def add_request(self, url: str, callback=None, **kwargs):
-        """Add a request to the queue"""
+    def add_request(self, url: str, callback=None, **kwargs) -> Future:
+        """
+        Add a request to the queue. The returned Future resolves to the
+        callback's result (None without a callback) once it has run.
+        """
         request_data = {
             'url': url,
             'callback': callback,
             'kwargs': kwargs,
             'timestamp': time.time()
         }
-        self.queue.put(request_data)
-    
-    def worker(self):
-        """Worker thread for processing requests"""
-        while self.running:
-            try:
-                request = self.queue.get(timeout=1)
-                
-                # Respect rate limiting
-                self.stealth_crawler.respect_rate_limit(self.requests_per_minute)
-                
-                # Add random delay
-                delay = self.stealth_crawler.calculate_delay()
-                time.sleep(delay)
-                
-                # Process the request (this would be implemented by the caller)
-                if request['callback']:
-                    result = request['callback'](request['url'], **request['kwargs'])
-                    self.results[request['url']] = result
-                
-                self.queue.task_done()
-                
-            except queue.Empty:
-                continue
-            except Exception as e:
-                print(f"Worker error: {e}")
+        future = Future()
+        if callback:
+            future.add_done_callback(lambda done: self._record_result(url, done))
+        if self._pool is None:
+            self._pending.append((request_data, future))
+        else:
+            self._pool.submit(self._process, request_data, future)
+        return future
+    
+    @property
+    def running(self) -> bool:
+        """Whether the worker pool is started"""
+        return self._pool is not None
+    
+    def _record_result(self, url: str, future: Future):
+        """Done callback: store a successful result under its URL"""
+        if not future.cancelled() and future.exception() is None:
+            self.results[url] = future.result()
+    
+    def _process(self, request: Dict, future: Future):
+        """Run one request on a pool thread; its Future is the only place the result is written"""
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            # Respect rate limiting
+            self._limiter.acquire()
+            
+            # Add random delay
+            delay = self.stealth_crawler.calculate_delay()
+            time.sleep(delay)
+            
+            # Process the request (this would be implemented by the caller)
+            result = None
+            if request['callback']:
+                result = request['callback'](request['url'], **request['kwargs'])
+        
+        except Exception as e:
+            print(f"Worker error: {e}")
+            future.set_exception(e)
+        else:
+            future.set_result(result)
     
     def start(self):
         """Start the worker threads"""
-        self.running = True
-        for i in range(self.max_workers):
-            worker_thread = threading.Thread(target=self.worker)
-            worker_thread.daemon = True
-            worker_thread.start()
-            self.workers.append(worker_thread)
+        if self._pool is not None:
+            return
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        pending, self._pending = self._pending, []
+        for request_data, future in pending:
+            self._pool.submit(self._process, request_data, future)
     
     def stop(self):
-        """Stop the worker threads"""
-        self.running = False
-        
-        # Wait for queue to empty
-        self.queue.join()
-        
-        # Wait for workers to finish
-        for worker in self.workers:
-            worker.join(timeout=5)
+        """Stop the worker threads once every queued request has been processed"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+_SEARCH_ENGINES = [
+    'https://www.google.com/search?q=',
+    'https://www.bing.com/search?q=',
+    'https://duckduckgo.com/?q=',
+    'https://search.yahoo.com/search?p='
+]
+
+_SOCIAL_MEDIA = [
+    'https://www.facebook.com/',
+    'https://twitter.com/',
+    'https://www.linkedin.com/',
+    'https://www.reddit.com/'
+]
+
+# (referer, append search term) options laid out so one uniform draw gives
+# 60% search engine, 20% social media and 20% direct access (no referer)
+_REFERER_POOL = (
+    [(engine, True) for engine in _SEARCH_ENGINES] * 3
+    + [(site, False) for site in _SOCIAL_MEDIA]
+    + [('', False)] * 4
+)
 
 def generate_realistic_referer(target_domain: str) -> str:
     """Generate a realistic referer header"""
-    search_engines = [
-        'https://www.google.com/search?q=',
-        'https://www.bing.com/search?q=',
-        'https://duckduckgo.com/?q=',
-        'https://search.yahoo.com/search?p='
-    ]
-    
-    social_media = [
-        'https://www.facebook.com/',
-        'https://twitter.com/',
-        'https://www.linkedin.com/',
-        'https://www.reddit.com/'
-    ]
-    
-    # 60% chance of search engine referer
-    if random.random() < 0.6:
-        search_engine = random.choice(search_engines)
+    referer, is_search = random.choice(_REFERER_POOL)
+    if is_search:
         query_terms = target_domain.split('.')[0]  # Use domain name as search term
-        return f"{search_engine}{query_terms}"
-    
-    # 20% chance of social media referer
-    elif random.random() < 0.8:
-        return random.choice(social_media)
-    
-    # 20% chance of direct access (no referer)
-    else:
-        return ""
+        return f"{referer}{query_terms}"
+    return referer
 
 def obfuscate_crawling_pattern(base_urls: List[str], decoy_ratio: float = 0.3) -> List[str]:
     """Add decoy requests to obfuscate crawling pattern"""
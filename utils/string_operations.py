@@ -1,29 +1,97 @@
+import os
 import re
 import zlib
-from typing import List, Tuple, Set
+from bisect import bisect_right
+from collections import defaultdict
+from typing import Iterable, List, Optional, Tuple, Set
 from difflib import SequenceMatcher
 
+# Patterns compiled once at import instead of looked up per call
+_NUMBER_RE = re.compile(r'\d+')
+_NON_ALPHA_RE = re.compile(r'[^a-zA-Z]')
+_BASE64_RE = re.compile(r'^[A-Za-z0-9+/=]+$')
+_HEX_RE = re.compile(r'^[A-Fa-f0-9]+$')
+_BINARY_RE = re.compile(r'^[01]+$')
+_DIGIT_RE = re.compile(r'\d')
+_SPECIAL_CHAR_RE = re.compile(r'[^a-zA-Z0-9.\-]')
+
+def _strip_common_affixes(s1: str, s2: str) -> Tuple[str, str]:
+    """Drop the shared prefix and suffix, which never contribute to an edit distance"""
+    start = 0
+    end1, end2 = len(s1), len(s2)
+    while start < end1 and start < end2 and s1[start] == s2[start]:
+        start += 1
+    while end1 > start and end2 > start and s1[end1 - 1] == s2[end2 - 1]:
+        end1 -= 1
+        end2 -= 1
+    return s1[start:end1], s2[start:end2]
+
+def _myers_distance(text: str, pattern: str, max_distance: Optional[int] = None) -> int:
+    """
+    Edit distance by Myers' bit-parallel algorithm (Hyyrö's formulation).
+    Each DP column over `pattern` is held as bit vectors in Python ints, so
+    one pass over `text` replaces the len(text) x len(pattern) cell loop.
+    With max_distance, returns max_distance + 1 as soon as the remaining
+    characters can no longer bring the distance back within it.
+    """
+    length = len(pattern)
+    peq = {}
+    bit = 1
+    for c in pattern:
+        peq[c] = peq.get(c, 0) | bit
+        bit <<= 1
+    mask = bit - 1
+    high = bit >> 1
+    pv, mv = mask, 0
+    score = length
+    remaining = len(text)
+    for c in text:
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = (ph << 1) | 1
+        pv = ((mh << 1) | ~(xv | ph)) & mask
+        mv = ph & xv & mask
+        remaining -= 1
+        # The score moves by at most one per remaining character
+        if max_distance is not None and score - remaining > max_distance:
+            return max_distance + 1
+    return score
+
 def levenshtein_distance(s1: str, s2: str) -> int:
     """
     Calculate Levenshtein (edit) distance between two strings
     """
+    s1, s2 = _strip_common_affixes(s1, s2)
     if len(s1) < len(s2):
-        return levenshtein_distance(s2, s1)
+        s1, s2 = s2, s1
     
     if len(s2) == 0:
         return len(s1)
     
-    previous_row = list(range(len(s2) + 1))
-    for i, c1 in enumerate(s1):
-        current_row = [i + 1]
-        for j, c2 in enumerate(s2):
-            insertions = previous_row[j + 1] + 1
-            deletions = current_row[j] + 1
-            substitutions = previous_row[j] + (c1 != c2)
-            current_row.append(min(insertions, deletions, substitutions))
-        previous_row = current_row
-    
-    return previous_row[-1]
+    # Bit vectors over the shorter string keep the ints small
+    return _myers_distance(s1, s2)
+
+def _bounded_levenshtein(s1: str, s2: str, max_distance: int) -> int:
+    """
+    Levenshtein distance that gives up once it must exceed max_distance,
+    returning max_distance + 1 in that case
+    """
+    s1, s2 = _strip_common_affixes(s1, s2)
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    if len(s1) - len(s2) > max_distance:
+        return max_distance + 1
+    if not s2:
+        return len(s1)
+
+    return min(_myers_distance(s1, s2, max_distance), max_distance + 1)
 
 def find_common_substring(strings: List[str]) -> str:
     """
@@ -40,19 +108,36 @@ def find_common_substring(strings: List[str]) -> str:
     
     for string in strings[1:]:
         # Find longest common substring between current common and this string
-        new_common = ""
-        for i in range(len(common)):
-            for j in range(i + 1, len(common) + 1):
-                substr = common[i:j]
-                if substr in string and len(substr) > len(new_common):
-                    new_common = substr
-        common = new_common
+        common = _longest_common_substring(common, string)
         
         if not common:
             break
     
     return common
 
+def _longest_common_substring(a: str, b: str) -> str:
+    """
+    Longest substring of a that occurs in b, earliest in a on ties.
+    If a length-k substring is shared, so is a length k-1 one, so the length
+    is binary searched with C-level `in` scans instead of trying every
+    substring of a.
+    """
+    def shared_at(length: int) -> int:
+        for i in range(len(a) - length + 1):
+            if a[i:i + length] in b:
+                return i
+        return -1
+
+    low, high, start = 0, min(len(a), len(b)), 0
+    while low < high:
+        mid = (low + high + 1) // 2
+        i = shared_at(mid)
+        if i >= 0:
+            low, start = mid, i
+        else:
+            high = mid - 1
+    return a[start:start + low]
+
 def extract_patterns(domains: List[str]) -> dict:
     """
     Extract common patterns from a list of domains
@@ -70,31 +155,22 @@ def extract_patterns(domains: List[str]) -> dict:
         'character_sets': set()
     }
     
-    # Find common prefix
-    if len(domains) > 1:
-        common_prefix = domains[0]
-        for domain in domains[1:]:
-            common_prefix = ''.join(c1 for c1, c2 in zip(common_prefix, domain) if c1 == c2)
-        patterns['common_prefix'] = common_prefix
-    
-    # Find common suffix
+    # Find common prefix and suffix (commonprefix only compares the min and max strings)
     if len(domains) > 1:
-        common_suffix = domains[0][::-1]
-        for domain in domains[1:]:
-            common_suffix = ''.join(c1 for c1, c2 in zip(common_suffix, domain[::-1]) if c1 == c2)
-        patterns['common_suffix'] = common_suffix[::-1]
+        patterns['common_prefix'] = os.path.commonprefix(domains)
+        patterns['common_suffix'] = os.path.commonprefix([domain[::-1] for domain in domains])[::-1]
     
     # Find longest common substring
     patterns['common_substring'] = find_common_substring(domains)
     
     # Analyze numerical patterns
     for domain in domains:
-        numbers = re.findall(r'\d+', domain)
+        numbers = _NUMBER_RE.findall(domain)
         patterns['numerical_patterns'].extend(numbers)
     
     # Analyze alphabetical patterns
     for domain in domains:
-        alpha_only = re.sub(r'[^a-zA-Z]', '', domain)
+        alpha_only = _NON_ALPHA_RE.sub('', domain)
         if alpha_only:
             patterns['alphabetical_patterns'].append(alpha_only)
     
@@ -104,24 +180,68 @@ def extract_patterns(domains: List[str]) -> dict:
         patterns['length_distribution'][length] = patterns['length_distribution'].get(length, 0) + 1
     
     # Character sets used
-    for domain in domains:
-        patterns['character_sets'].update(set(domain.lower()))
+    patterns['character_sets'] = set().union(*map(str.lower, domains))
     
     return patterns
 
-def detect_sequential_patterns(domains: List[str], max_edit_distance: int = 2) -> List[Tuple[str, str, int]]:
+def _segment_layout(length: int, parts: int) -> List[Tuple[int, int]]:
+    """Split a length into `parts` near-equal (start, size) segments, longer ones last"""
+    size, extra = divmod(length, parts)
+    layout = []
+    start = 0
+    for n in range(parts):
+        segment = size + (n >= parts - extra)
+        layout.append((start, segment))
+        start += segment
+    return layout
+
+def detect_sequential_patterns(domains: List[str], max_edit_distance: int = 2,
+                               limit: Optional[int] = None) -> List[Tuple[str, str, int]]:
     """
     Detect sequential patterns in domain names
-    Returns list of (domain1, domain2, edit_distance) for sequential patterns
+    Returns list of (domain1, domain2, edit_distance) for sequential patterns,
+    stopping early once `limit` pairs have been found
     """
     sequential_pairs = []
-    
-    for i in range(len(domains)):
-        for j in range(i + 1, len(domains)):
-            distance = levenshtein_distance(domains[i], domains[j])
+    if max_edit_distance < 0:
+        return sequential_pairs
+
+    # Pigeonhole filter: split every string into max_edit_distance + 1
+    # segments. Each edit touches at most one segment, so a string within
+    # the distance contains some segment intact, shifted by at most
+    # max_edit_distance. Indexing segments by (length, segment number, text)
+    # finds the candidates without comparing every pair of similar length.
+    parts = max_edit_distance + 1
+    layouts = {}
+    index = defaultdict(list)
+    for i, domain in enumerate(domains):
+        length = len(domain)
+        layout = layouts.get(length)
+        if layout is None:
+            layout = layouts[length] = _segment_layout(length, parts)
+        for n, (start, size) in enumerate(layout):
+            index[(length, n, domain[start:start + size])].append(i)
+
+    for i, domain in enumerate(domains):
+        length = len(domain)
+        candidates = set()
+        for other in range(length - max_edit_distance, length + max_edit_distance + 1):
+            layout = layouts.get(other)
+            if layout is None:
+                continue
+            for n, (start, size) in enumerate(layout):
+                for shift in range(max(0, start - max_edit_distance), min(start + max_edit_distance, length - size) + 1):
+                    bucket = index.get((other, n, domain[shift:shift + size]))
+                    if bucket:
+                        # Buckets hold indices in ascending order; only later strings pair with i
+                        candidates.update(bucket[bisect_right(bucket, i):])
+        for j in sorted(candidates):
+            distance = _bounded_levenshtein(domain, domains[j], max_edit_distance)
             if distance <= max_edit_distance:
-                sequential_pairs.append((domains[i], domains[j], distance))
-    
+                sequential_pairs.append((domain, domains[j], distance))
+                if limit is not None and len(sequential_pairs) >= limit:
+                    return sequential_pairs
+
     return sequential_pairs
 
 def compression_ratio(text: str) -> float:
@@ -132,13 +252,8 @@ def compression_ratio(text: str) -> float:
     if not text:
         return 0.0
     
-    original_size = len(text.encode('utf-8'))
-    compressed_size = len(zlib.compress(text.encode('utf-8')))
-    
-    if original_size == 0:
-        return 0.0
-    
-    return compressed_size / original_size
+    data = text.encode('utf-8')
+    return len(zlib.compress(data)) / len(data)
 
 def analyze_compression_patterns(domains: List[str]) -> dict:
     """
@@ -179,15 +294,15 @@ def detect_encoding_patterns(domain: str) -> dict:
     clean_domain = domain.replace('.', '')
     
     # Base64-like pattern (alphanumeric + some special chars)
-    if re.match(r'^[A-Za-z0-9+/=]+$', clean_domain) and len(clean_domain) % 4 == 0:
+    if _BASE64_RE.match(clean_domain) and len(clean_domain) % 4 == 0:
         patterns['base64_like'] = True
     
     # Hex-like pattern
-    if re.match(r'^[A-Fa-f0-9]+$', clean_domain) and len(clean_domain) % 2 == 0:
+    if _HEX_RE.match(clean_domain) and len(clean_domain) % 2 == 0:
         patterns['hex_like'] = True
     
     # Binary-like pattern (mostly 0s and 1s)
-    if re.match(r'^[01]+$', clean_domain):
+    if _BINARY_RE.match(clean_domain):
         patterns['binary_like'] = True
     
     # URL encoded patterns
@@ -195,13 +310,49 @@ def detect_encoding_patterns(domain: str) -> dict:
         patterns['url_encoded'] = True
     
     # Contains numbers
-    patterns['has_numbers'] = bool(re.search(r'\d', domain))
+    patterns['has_numbers'] = bool(_DIGIT_RE.search(domain))
     
     # Contains special characters (non-alphanumeric, non-dot, non-dash)
-    patterns['has_special_chars'] = bool(re.search(r'[^a-zA-Z0-9.\-]', domain))
+    patterns['has_special_chars'] = bool(_SPECIAL_CHAR_RE.search(domain))
     
     return patterns
 
+# Deletion tables for ASCII character-class checks in count_encoding_patterns
+_ALNUM = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789'
+_DEL_BASE64 = str.maketrans('', '', _ALNUM + '+/=')
+_DEL_HEX = str.maketrans('', '', '0123456789ABCDEFabcdef')
+_DEL_BINARY = str.maketrans('', '', '01')
+_DEL_DIGITS = str.maketrans('', '', '0123456789')
+_DEL_HOSTNAME = str.maketrans('', '', _ALNUM + '.-')
+
+def count_encoding_patterns(domains: Iterable[str]) -> int:
+    """
+    Count the encoding indicators set across domains, i.e. the sum of the
+    True values detect_encoding_patterns would return for each of them
+    """
+    total = 0
+    for domain in domains:
+        # ASCII strings are classified with C-level translate calls; anything
+        # else (and the '$'-before-newline regex corner case) takes the slow path
+        if not domain.isascii() or '\n' in domain:
+            total += sum(detect_encoding_patterns(domain).values())
+            continue
+        clean = domain.replace('.', '')
+        if clean:
+            if not clean.translate(_DEL_BASE64) and len(clean) % 4 == 0:
+                total += 1
+            if not clean.translate(_DEL_HEX) and len(clean) % 2 == 0:
+                total += 1
+            if not clean.translate(_DEL_BINARY):
+                total += 1
+        if '%' in domain:
+            total += 1
+        if len(domain.translate(_DEL_DIGITS)) != len(domain):
+            total += 1
+        if domain.translate(_DEL_HOSTNAME):
+            total += 1
+    return total
+
 def similarity_score(s1: str, s2: str) -> float:
     """
     Calculate similarity score between two strings (0-1)
@@ -216,8 +367,15 @@ def find_similar_domains(target: str, domain_list: List[str], threshold: float =
     """
     similar = []
     
+    # Same scoring as similarity_score (target as seq1, since ratio() is
+    # asymmetric); the real_quick_ratio()/quick_ratio() upper bounds, borrowed
+    # from difflib.get_close_matches, reject most candidates before ratio()
+    target = target.lower()
     for domain in domain_list:
-        score = similarity_score(target, domain)
+        matcher = SequenceMatcher(None, target, domain.lower())
+        if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+            continue
+        score = matcher.ratio()
         if score >= threshold:
             similar.append((domain, score))
     
@@ -1,14 +1,105 @@
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
+from requests.compat import chardet
 import socket
 import ssl
 import whois
-import dns.resolver
+import dns.asyncresolver
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from urllib.parse import urlparse, urljoin
 from typing import Dict, List, Optional, Tuple
 import re
 from datetime import datetime
 import time
 
+DNS_RECORD_TYPES = ('A', 'AAAA', 'MX', 'NS', 'TXT', 'CNAME')
+
+# Connection pool sizing for the shared session
+HTTP_POOL_HOSTS = 100
+HTTP_POOL_PER_HOST = 32
+
+# Upper bound on how much of a page extract_page_metadata reads
+PAGE_READ_LIMIT = 256 * 1024
+
+# Page metadata and contact patterns, compiled once at import
+_TITLE_RE = re.compile(r'<title[^>]*>([^<]+)</title>', re.IGNORECASE)
+_META_RE = re.compile(r'<meta[^>]*name=["\']([^"\']+)["\'][^>]*content=["\']([^"\']*)["\'][^>]*>', re.IGNORECASE)
+_LINK_RE = re.compile(r'<a[^>]*href=["\']([^"\']+)["\'][^>]*>', re.IGNORECASE)
+_IMG_RE = re.compile(r'<img[^>]*src=["\']([^"\']+)["\'][^>]*>', re.IGNORECASE)
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_PHONE_RE = re.compile(r'(?:\+?1[-.\s]?)?\(?[2-9][0-8][0-9]\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}')
+
+# WHOIS privacy-service markers. 'domains by proxy' and 'perfect privacy'
+# are covered by 'proxy' and 'privacy'; 'redacted' (GDPR) is the most common
+_PRIVACY_INDICATORS = ('redacted', 'privacy', 'private', 'whoisguard', 'proxy')
+
+# Shared async resolver; building one parses the system resolver config
+_async_resolver: Optional[dns.asyncresolver.Resolver] = None
+
+
+def _get_async_resolver() -> dns.asyncresolver.Resolver:
+    global _async_resolver
+    if _async_resolver is None:
+        _async_resolver = dns.asyncresolver.Resolver()
+    return _async_resolver
+
+def _run_sync(coro):
+    """
+    Run a coroutine to completion from synchronous code. asyncio.run refuses to
+    start inside a running event loop, so in that case it runs on a worker thread.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+# Shared TLS context; building one loads and parses the CA bundle
+_ssl_context: Optional[ssl.SSLContext] = None
+
+
+def _get_ssl_context() -> ssl.SSLContext:
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = ssl.create_default_context()
+    return _ssl_context
+
+def _detect_encoding(raw: bytes) -> str:
+    """
+    Guess the charset of a body read in streaming mode. Uses the detector behind
+    response.apparent_encoding, which cannot be read once the stream is consumed.
+    """
+    if chardet is not None:
+        encoding = chardet.detect(raw)['encoding']
+        if encoding:
+            return encoding
+    return 'utf-8'
+
+_CERT_MONTHS = {month: number for number, month in enumerate(
+    ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'), 1)}
+_CERT_TIME_FORMAT = '%b %d %H:%M:%S %Y %Z'
+
+
+def _parse_cert_time(value: str) -> datetime:
+    """
+    Parse an OpenSSL certificate time such as 'Mar  9 12:00:00 2027 GMT'
+    without strptime's per-call format handling. Anything unexpected goes
+    through strptime with the same format, so errors are unchanged.
+    """
+    parts = value.split()
+    if len(parts) == 5 and parts[4] == 'GMT' and parts[0] in _CERT_MONTHS:
+        clock = parts[2].split(':')
+        if len(clock) == 3 and parts[1].isdigit() and parts[3].isdigit() and all(c.isdigit() for c in clock):
+            try:
+                return datetime(int(parts[3]), _CERT_MONTHS[parts[0]], int(parts[1]),
+                                int(clock[0]), int(clock[1]), int(clock[2]))
+            except ValueError:
+                pass
+    return datetime.strptime(value, _CERT_TIME_FORMAT)
+
 class WebAnalyzer:
     """Utilities for web analysis and domain verification"""
     
@@ -16,6 +107,13 @@ class WebAnalyzer:
         self.timeout = timeout
         self.max_retries = max_retries
         self.session = requests.Session()
+        # Keep connections to many hosts, and enough per host for every
+        # worker thread sharing this session, instead of the 10/10 default.
+        # Retries stay at the default: each one would add a full timeout on
+        # unreachable domains.
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_HOSTS, pool_maxsize=HTTP_POOL_PER_HOST)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         
         # Common headers for legitimate-looking requests
         self.session.headers.update({
@@ -26,6 +124,16 @@ class WebAnalyzer:
             'Connection': 'keep-alive'
         })
     
+    def close(self):
+        """Release pooled HTTP connections held by the shared session"""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
     def check_domain_accessibility(self, domain: str) -> Dict[str, any]:
         """Check if domain is accessible via HTTP/HTTPS"""
         result = {
@@ -80,6 +188,14 @@ class WebAnalyzer:
         
         return result
     
+    def check_domain_accessibility_many(self, domains: List[str], max_workers: int = 10) -> Dict[str, Dict[str, any]]:
+        """
+        Check several domains concurrently over the shared session, so their
+        network waits overlap. Returns results keyed by domain.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return dict(zip(domains, pool.map(self.check_domain_accessibility, domains)))
+    
     def get_ssl_certificate_info(self, domain: str) -> Dict[str, any]:
         """Get SSL certificate information"""
         result = {
@@ -94,7 +210,7 @@ class WebAnalyzer:
         }
         
         try:
-            context = ssl.create_default_context()
+            context = _get_ssl_context()
             
             with socket.create_connection((domain, 443), timeout=self.timeout) as sock:
                 with context.wrap_socket(sock, server_hostname=domain) as ssock:
@@ -110,13 +226,13 @@ class WebAnalyzer:
                         # Parse dates
                         not_after = cert.get('notAfter')
                         if not_after:
-                            expiry_date = datetime.strptime(not_after, '%b %d %H:%M:%S %Y %Z')
+                            expiry_date = _parse_cert_time(not_after)
                             result['valid_to'] = expiry_date
                             result['days_until_expiry'] = (expiry_date - datetime.now()).days
                         
                         not_before = cert.get('notBefore')
                         if not_before:
-                            result['valid_from'] = datetime.strptime(not_before, '%b %d %H:%M:%S %Y %Z')
+                            result['valid_from'] = _parse_cert_time(not_before)
         
         except Exception as e:
             result['error'] = str(e)
@@ -160,41 +276,54 @@ class WebAnalyzer:
                 result['age_days'] = (datetime.now() - creation_date).days
             
             # Check for privacy protection (common indicators)
-            privacy_indicators = [
-                'privacy', 'private', 'redacted', 'whoisguard', 'proxy',
-                'domains by proxy', 'perfect privacy'
-            ]
-            
             whois_text = str(w).lower()
-            result['privacy_protected'] = any(indicator in whois_text for indicator in privacy_indicators)
+            result['privacy_protected'] = any(indicator in whois_text for indicator in _PRIVACY_INDICATORS)
         
         except Exception as e:
             result['error'] = str(e)
         
         return result
     
+    def get_whois_info_many(self, domains: List[str], max_workers: int = 8) -> Dict[str, Dict[str, any]]:
+        """
+        Look up WHOIS for several domains concurrently; each lookup is its own
+        registry connection, so the waits overlap. Returns results keyed by domain.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return dict(zip(domains, pool.map(self.get_whois_info, domains)))
+    
     def get_dns_records(self, domain: str) -> Dict[str, List[str]]:
-        """Get various DNS records for domain"""
-        records = {
-            'A': [],
-            'AAAA': [],
-            'MX': [],
-            'NS': [],
-            'TXT': [],
-            'CNAME': []
-        }
+        """Get various DNS records for domain; safe to call from inside an event loop"""
+        return _run_sync(self.get_dns_records_async(domain))
+    
+    async def get_dns_records_async(self, domain: str) -> Dict[str, List[str]]:
+        """Get various DNS records for domain, querying all record types concurrently"""
+        records = {record_type: [] for record_type in DNS_RECORD_TYPES}
         
-        record_types = ['A', 'AAAA', 'MX', 'NS', 'TXT', 'CNAME']
+        try:
+            resolver = _get_async_resolver()
+        except Exception:
+            return records  # No usable resolver configuration
         
-        for record_type in record_types:
-            try:
-                answers = dns.resolver.resolve(domain, record_type)
-                records[record_type] = [str(answer) for answer in answers]
-            except Exception:
-                pass  # Record type not found or error
+        answers = await asyncio.gather(
+            *(resolver.resolve(domain, record_type) for record_type in DNS_RECORD_TYPES),
+            return_exceptions=True
+        )
+        for record_type, answer in zip(DNS_RECORD_TYPES, answers):
+            if not isinstance(answer, BaseException):  # Record type not found or error
+                records[record_type] = [str(rdata) for rdata in answer]
         
         return records
     
+    def get_dns_records_many(self, domains: List[str]) -> Dict[str, Dict[str, List[str]]]:
+        """Get DNS records for several domains in one event loop, keyed by domain"""
+        return _run_sync(self.get_dns_records_many_async(domains))
+    
+    async def get_dns_records_many_async(self, domains: List[str]) -> Dict[str, Dict[str, List[str]]]:
+        """Get DNS records for several domains, all lookups in flight at once"""
+        results = await asyncio.gather(*(self.get_dns_records_async(domain) for domain in domains))
+        return dict(zip(domains, results))
+    
     def extract_page_metadata(self, url: str) -> Dict[str, any]:
         """Extract metadata from webpage"""
         result = {
@@ -211,18 +340,32 @@ class WebAnalyzer:
         }
         
         try:
-            response = self.session.get(url, timeout=self.timeout)
-            content = response.text
+            # Metadata lives near the top of the page, so read at most PAGE_READ_LIMIT bytes
+            with self.session.get(url, timeout=self.timeout, stream=True) as response:
+                chunks = []
+                total = 0
+                truncated = False
+                for chunk in response.iter_content(65536):
+                    chunks.append(chunk)
+                    total += len(chunk)
+                    if total >= PAGE_READ_LIMIT:
+                        truncated = True
+                        break
+                raw = b''.join(chunks)
+                content = str(raw, response.encoding or _detect_encoding(raw), errors='replace')
+                declared_length = response.headers.get('Content-Length', '')
+            
             result['content_length'] = len(content)
+            if truncated and declared_length.isdigit():
+                result['content_length'] = max(len(content), int(declared_length))
             
             # Extract basic meta information
-            title_match = re.search(r'<title[^>]*>([^<]+)</title>', content, re.IGNORECASE)
+            title_match = _TITLE_RE.search(content)
             if title_match:
                 result['title'] = title_match.group(1).strip()
             
             # Extract meta tags
-            meta_pattern = r'<meta[^>]*name=["\']([^"\']+)["\'][^>]*content=["\']([^"\']*)["\'][^>]*>'
-            meta_matches = re.findall(meta_pattern, content, re.IGNORECASE)
+            meta_matches = _META_RE.findall(content)
             
             for name, content_val in meta_matches:
                 if name.lower() == 'description':
@@ -233,14 +376,13 @@ class WebAnalyzer:
                     result['language'] = content_val
             
             # Extract links
-            link_pattern = r'<a[^>]*href=["\']([^"\']+)["\'][^>]*>'
-            links = re.findall(link_pattern, content, re.IGNORECASE)
-            result['links'] = [urljoin(url, link) for link in links[:50]]  # Limit to first 50
+            # Only the first matches are kept, so stop scanning once there are enough
+            links = islice(_LINK_RE.finditer(content), 50)
+            result['links'] = [urljoin(url, link.group(1)) for link in links]  # Limit to first 50
             
             # Extract images
-            img_pattern = r'<img[^>]*src=["\']([^"\']+)["\'][^>]*>'
-            images = re.findall(img_pattern, content, re.IGNORECASE)
-            result['images'] = [urljoin(url, img) for img in images[:20]]  # Limit to first 20
+            images = islice(_IMG_RE.finditer(content), 20)
+            result['images'] = [urljoin(url, img.group(1)) for img in images]  # Limit to first 20
         
         except Exception as e:
             result['error'] = str(e)
@@ -307,16 +449,15 @@ class WebAnalyzer:
             'addresses': []
         }
         
-        # Email pattern
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        contacts['emails'] = re.findall(email_pattern, content)
+        # Email pattern; every match needs an '@', so skip the sweep without one
+        if '@' in content:
+            contacts['emails'] = _EMAIL_RE.findall(content)
         
         # Phone pattern (simplified)
-        phone_pattern = r'(?:\+?1[-.\s]?)?\(?[2-9][0-8][0-9]\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}'
-        contacts['phones'] = re.findall(phone_pattern, content)
+        contacts['phones'] = _PHONE_RE.findall(content)
         
-        # Remove duplicates
-        contacts['emails'] = list(set(contacts['emails']))
-        contacts['phones'] = list(set(contacts['phones']))
+        # Remove duplicates, keeping first-seen order
+        contacts['emails'] = list(dict.fromkeys(contacts['emails']))
+        contacts['phones'] = list(dict.fromkeys(contacts['phones']))
         
         return contacts
\ No newline at end of file